@@ -0,0 +1,37 @@
+import argparse
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+
+from dao.extra_work import ARCHIVE_BATCH_SIZE, ExtraWorkDAO
+
+
+logger = logging.getLogger(__name__)
+
+# Через сколько дней после завершения оплаченная заявка переносится в архив
+ARCHIVE_AFTER_DAYS = float(os.environ.get('MIS_ARCHIVE_AFTER_DAYS', 30))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Перенос старых оплаченных заявок в архив')
+    parser.add_argument('--db', default='prod', help='файл базы данных')
+    parser.add_argument('--older-than-days', type=float, default=ARCHIVE_AFTER_DAYS,
+                        help='сколько дней должно пройти после завершения заявки')
+    parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE, help='заявок в одной транзакции')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    ended_before = (datetime.now() - timedelta(days=args.older_than_days)).strftime('%Y-%m-%d %H:%M:%S')
+    dao = ExtraWorkDAO(args.db)
+    try:
+        started = time.perf_counter()
+        archived = dao.archive_paid_extra_works(ended_before, args.batch_size)
+        logger.info('Перенесено в архив заявок: %d, завершенных до %s, за %.2f с',
+                    archived, ended_before, time.perf_counter() - started)
+    finally:
+        dao.close()
+
+
+if __name__ == "__main__":
+    main()
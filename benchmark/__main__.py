@@ -0,0 +1,65 @@
+"""Запуск: python -m benchmark --extra-works 1000000 --output results.json"""
+import argparse
+import json
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+from dataclasses import fields
+
+from benchmark.dataset import DatasetSize, generate
+from benchmark.suite import run_suite
+from dao import instrumentation
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark', description='Замеры производительности слоя DAO')
+    parser.add_argument('--db', default='benchmark.db', help='файл синтетической базы данных')
+    parser.add_argument('--reuse', action='store_true', help='не пересоздавать базу, если она уже есть')
+    parser.add_argument('--repeat', type=int, default=5, help='число повторов каждого сценария')
+    parser.add_argument('--operations', type=int, default=100, help='заявок на один повтор назначения и оплаты')
+    parser.add_argument('--instrument', action='store_true', help='добавить в отчет статистику SQL-запросов')
+    parser.add_argument('--output', help='файл для результатов в JSON (по умолчанию stdout)')
+    for field in fields(DatasetSize):
+        parser.add_argument(f"--{field.name.replace('_', '-')}", type=int, default=field.default)
+    args = parser.parse_args(argv)
+
+    size = DatasetSize(**{field.name: getattr(args, field.name) for field in fields(DatasetSize)})
+    generation_time = None
+    if not args.reuse:
+        started = time.perf_counter()
+        generate(args.db, size)
+        generation_time = time.perf_counter() - started
+
+    if args.instrument:
+        instrumentation.enable()
+        instrumentation.reset()
+    report = {
+        'commit': _git_commit(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'dataset': size.to_dict(),
+        'generation_seconds': generation_time,
+        'results': run_suite(args.db, args.repeat, args.operations),
+    }
+    if args.instrument:
+        report['queries'] = instrumentation.snapshot()
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(text + '\n')
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
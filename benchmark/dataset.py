@@ -0,0 +1,106 @@
+import os
+import random
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, Tuple
+
+from dao.bulk import insert_many
+from dao.connection import connect
+
+
+STATUSES = ("pending", "in progress", "done", "paid")
+FIRST_NAMES = ("Павел", "Анна", "Иван", "Жанна", "Олег", "Мария", "Сергей", "Елена", "Дмитрий", "Ольга")
+LAST_NAMES = ("Репин", "Васильева", "Петров", "Смирнова", "Кузнецов", "Попова", "Соколов", "Морозова")
+WORK_TYPES = ("Клининг", "Ремонт", "Техническое обслуживание", "Организация", "Обучение", "Доставка")
+
+
+@dataclass
+class DatasetSize:
+    """Размер синтетической базы данных."""
+    clients: int = 1000
+    posts: int = 10
+    duties_per_post: int = 5
+    workers: int = 200
+    work_types: int = 30
+    extra_works: int = 100000
+    seed: int = 0
+
+    def to_dict(self) -> Dict[str, int]:
+        return asdict(self)
+
+
+def _time(moment: datetime) -> str:
+    return moment.strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _clients(size: DatasetSize, rnd: random.Random) -> Iterator[Tuple]:
+    for _ in range(size.clients):
+        yield rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES), f"+79{rnd.randrange(10 ** 9):09d}"
+
+
+def _workers(size: DatasetSize, rnd: random.Random, post_ids) -> Iterator[Tuple]:
+    for number in range(size.workers):
+        # Номер в имени делает ФИО уникальным: окно менеджера ищет работника по имени
+        full_name = f"{rnd.choice(FIRST_NAMES)} {rnd.choice(LAST_NAMES)} {number}"
+        yield (full_name, rnd.choice(("М", "Ж")), f"+79{rnd.randrange(10 ** 9):09d}",
+               f"{rnd.randrange(10 ** 6):06d}", f"{rnd.randrange(10 ** 4):04d}", rnd.choice(post_ids), 0.0)
+
+
+def _extra_works(size: DatasetSize, rnd: random.Random, worker_ids, work_types, client_ids) -> Iterator[Tuple]:
+    origin = datetime(2024, 1, 1)
+    for _ in range(size.extra_works):
+        work_type_id, work_type_name = rnd.choice(work_types)
+        status = rnd.choice(STATUSES)
+        start_time = end_time = assignee = None
+        if status != "pending":
+            started = origin + timedelta(seconds=rnd.randrange(365 * 24 * 3600))
+            start_time = _time(started)
+            assignee = rnd.choice(worker_ids)
+            if status in ("done", "paid"):
+                end_time = _time(started + timedelta(seconds=rnd.randrange(60, 8 * 3600)))
+        yield work_type_name, start_time, end_time, assignee, work_type_id, status, rnd.choice(client_ids)
+
+
+def generate(db_name: str, size: DatasetSize, overwrite: bool = True) -> str:
+    """Создает базу данных заданного размера с воспроизводимыми случайными данными."""
+    if overwrite:
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(db_name + suffix):
+                os.remove(db_name + suffix)
+
+    rnd = random.Random(size.seed)
+    connection = connect(db_name)
+    try:
+        client_ids = insert_many(connection, '''
+            INSERT INTO client (first_name, last_name, phone_number) VALUES (?, ?, ?)
+        ''', _clients(size, rnd))
+        post_ids = insert_many(connection, 'INSERT INTO post (title) VALUES (?)',
+                               ((f"Должность {number}",) for number in range(size.posts)))
+        duty_ids = insert_many(connection, 'INSERT INTO duties (description) VALUES (?)',
+                               ((f"Обязанность {number}",) for number in range(size.posts * size.duties_per_post)))
+        insert_many(connection, 'INSERT INTO post_duties (post_id, duty_id) VALUES (?, ?)', (
+            (post_id, duty_ids[index * size.duties_per_post + offset])
+            for index, post_id in enumerate(post_ids)
+            for offset in range(size.duties_per_post)
+        ))
+        worker_ids = insert_many(connection, '''
+            INSERT INTO worker (full_name, sex, phone_number, passport_number, passport_series, post_id, balance)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', _workers(size, rnd, post_ids))
+
+        type_rows = [(f"Описание работы {number}", float(rnd.randrange(50, 500, 10)), rnd.choice(WORK_TYPES))
+                     for number in range(size.work_types)]
+        type_ids = insert_many(connection, '''
+            INSERT INTO extra_work_type (description, payment, type) VALUES (?, ?, ?)
+        ''', type_rows)
+        work_types = [(type_id, row[2]) for type_id, row in zip(type_ids, type_rows)]
+
+        insert_many(connection, '''
+            INSERT INTO extra_work (type, start_time, end_time, assignee, extra_work_type_id, status, client_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', _extra_works(size, rnd, worker_ids, work_types, client_ids))
+        connection.execute('ANALYZE')
+        connection.commit()
+    finally:
+        connection.close()
+    return db_name
@@ -0,0 +1,91 @@
+"""Запуск: python -m benchmark.startup --db prod --runs 5 --budget-ms 500"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Бюджет холодного запуска до первой отрисовки окна выбора роли, мс
+STARTUP_BUDGET_MS = float(os.environ.get('MIS_STARTUP_BUDGET_MS', 500))
+
+
+def _child(db_name: str):
+    """Запускает приложение до первой отрисовки окна выбора роли и печатает время этапов."""
+    phases = {}
+    started = time.perf_counter()
+
+    def phase(name: str):
+        nonlocal started
+        now = time.perf_counter()
+        phases[name] = (now - started) * 1000
+        started = now
+
+    from PyQt5.QtWidgets import QApplication
+    from start_window import StartWindow
+    phase('imports')
+
+    from dao.connection import get_connection, release_connection
+    get_connection(db_name)
+    release_connection(db_name)
+    phase('database')
+
+    app = QApplication(sys.argv[:1])
+    phase('application')
+
+    window = StartWindow(db_name)
+    phase('start_window')
+
+    window.show()
+    app.processEvents()
+    phase('first_paint')
+
+    print(json.dumps({'phases': phases, 'ready_at': time.time()}))
+
+
+def measure_startup(db_name: str, runs: int):
+    """Запускает приложение runs раз в новом интерпретаторе; возвращает медианы этапов и общего времени в мс."""
+    env = dict(os.environ)
+    # Окно не показывается на экране, но отрисовывается так же, как при обычном запуске
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    totals = []
+    phases = {}
+    for _ in range(runs):
+        spawned_at = time.time()
+        output = subprocess.run([sys.executable, '-m', 'benchmark.startup', '--child', '--db', db_name],
+                                capture_output=True, text=True, check=True, env=env).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        totals.append((result['ready_at'] - spawned_at) * 1000)
+        for name, value in result['phases'].items():
+            phases.setdefault(name, []).append(value)
+    return {
+        'runs': runs,
+        'total_ms': statistics.median(totals),
+        'phases_ms': {name: statistics.median(values) for name, values in phases.items()},
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmark.startup',
+                                     description='Замер холодного запуска приложения')
+    parser.add_argument('--db', default='prod', help='файл базы данных')
+    parser.add_argument('--runs', type=int, default=5, help='число запусков')
+    parser.add_argument('--budget-ms', type=float, default=STARTUP_BUDGET_MS,
+                        help='допустимая медиана времени запуска')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        _child(args.db)
+        return 0
+
+    report = measure_startup(args.db, args.runs)
+    report['budget_ms'] = args.budget_ms
+    report['within_budget'] = report['total_ms'] <= args.budget_ms
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    return 0 if report['within_budget'] else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import gc
+import statistics
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+from dao.connection import close_thread_daos, thread_dao
+from dao.dispatch import DispatchDAO
+from dao.extra_work import ExtraWorkDAO
+from dao.worker import WorkerDAO
+from request_format import format_customer_request
+
+
+def measure(run: Callable[[int], object], repeat: int) -> Dict[str, float]:
+    """Выполняет run(номер повтора) repeat раз и возвращает статистику времени в секундах."""
+    timings = []
+    for attempt in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run(attempt)
+        timings.append(time.perf_counter() - started)
+    return {
+        'repeat': repeat,
+        'min': min(timings),
+        'median': statistics.median(timings),
+        'mean': statistics.fmean(timings),
+        'max': max(timings),
+    }
+
+
+def load_requests(db_name: str) -> List[str]:
+    """Загрузка списка заявок как в окне клиента: все заявки с деталями и текст каждой строки."""
+    return [format_customer_request(request)
+            for request in thread_dao(ExtraWorkDAO, db_name).get_all_extra_work_details()]
+
+
+def assign(db_name: str, request_ids: List[int], worker_names: List[str]):
+    """Назначение заявок как в окне менеджера: поиск работника по имени и обновление заявки."""
+    start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    for index, request_id in enumerate(request_ids):
+        worker = thread_dao(WorkerDAO, db_name).get_worker_by_name(worker_names[index % len(worker_names)])
+        thread_dao(ExtraWorkDAO, db_name).update_extra_work(
+            request_id, status="in progress", assignee=worker.id, start_time=start_time)
+
+
+def pay(db_name: str, request_ids: List[int]):
+    """Оплата выполненных заявок как в окне менеджера."""
+    for request_id in request_ids:
+        work = thread_dao(ExtraWorkDAO, db_name).get_extra_work_details(request_id)
+        worker = thread_dao(WorkerDAO, db_name).get_worker(work.assignee)
+        thread_dao(WorkerDAO, db_name).update_worker_balance(worker.id, worker.balance + work.payment)
+        thread_dao(ExtraWorkDAO, db_name).update_extra_work(request_id, status="paid")
+
+
+def run_suite(db_name: str, repeat: int = 5, operations: int = 100) -> Dict[str, Dict[str, float]]:
+    """Замеряет основные сценарии на готовой базе данных.
+
+    Сценарии назначения и оплаты меняют данные: на каждый повтор берутся
+    новые operations заявок в статусе pending и done соответственно.
+    Автоназначение затем распределяет все оставшиеся заявки pending.
+    """
+    works = thread_dao(ExtraWorkDAO, db_name)
+    workers = thread_dao(WorkerDAO, db_name)
+    pending_ids = [work.id for work in works.get_extra_works_by_status("pending")][:repeat * operations]
+    done_ids = [work.id for work in works.get_extra_works_by_status("done")][:repeat * operations]
+    worker_names = [full_name for _, full_name, _ in workers.get_worker_summaries()]
+
+    def batch(ids: List[int], attempt: int) -> List[int]:
+        return ids[attempt * operations:(attempt + 1) * operations]
+
+    results = {
+        'get_all_extra_works': measure(lambda attempt: works.get_all_extra_works(), repeat),
+        'get_all_workers': measure(lambda attempt: workers.get_all_workers(), repeat),
+        'load_requests': measure(lambda attempt: load_requests(db_name), repeat),
+        'assign_work': measure(lambda attempt: assign(db_name, batch(pending_ids, attempt), worker_names), repeat),
+        'pay_for_work': measure(lambda attempt: pay(db_name, batch(done_ids, attempt)), repeat),
+    }
+    for name in ('assign_work', 'pay_for_work'):
+        results[name]['operations'] = operations
+    # Автоназначение разбирает все оставшиеся заявки pending, поэтому выполняется один раз и последним
+    pending = len(works.get_extra_works_by_status("pending"))
+    results['auto_dispatch'] = measure(lambda attempt: thread_dao(DispatchDAO, db_name).auto_dispatch(), 1)
+    results['auto_dispatch']['operations'] = pending
+    close_thread_daos()
+    return results
@@ -0,0 +1,109 @@
+import json
+import logging
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from PyQt5.QtNetwork import QAbstractSocket, QTcpSocket
+
+from dao import connection
+from dao.notifications import ALL_DATABASES, encode_message, hub_address, notification_key
+
+
+logger = logging.getLogger(__name__)
+
+# Таблицы, о которых сообщается после подключения, чтобы окно догнало пропущенные изменения
+ALL_TABLES = frozenset({'extra_work', 'extra_work_type', 'worker', 'client', 'post_work_type'})
+# Интервал опроса базы данных, пока концентратор уведомлений недоступен, и попыток переподключения
+FALLBACK_INTERVAL_MS = 4000
+
+
+class ChangeNotifier(QObject):
+    """Подписка окна на уведомления концентратора об изменениях базы данных.
+
+    Пока концентратор доступен, таймер опроса fallback_timer остановлен и база данных
+    не опрашивается; при потере соединения таймер запускается снова, а подписка
+    восстанавливается в фоне.
+
+    После подключения окну сообщается об изменении всех таблиц, чтобы оно догнало
+    пропущенное, но не раньше, чем окно вызовет loaded() после своей первой загрузки.
+    """
+
+    # Множество имен измененных таблиц
+    changed = pyqtSignal(object)
+
+    def __init__(self, db_name: str, fallback_timer: QTimer, parent=None):
+        super().__init__(parent)
+        # Через сервер API окна могут не знать путь к базе, поэтому подписываются на все базы
+        self.key = ALL_DATABASES if connection.API_URL else notification_key(db_name)
+        self.fallback_timer = fallback_timer
+        self.address = hub_address()
+        self.socket = QTcpSocket(self)
+        self.socket.connected.connect(self._on_connected)
+        self.socket.disconnected.connect(self._on_disconnected)
+        self.socket.errorOccurred.connect(self._on_error)
+        self.socket.readyRead.connect(self._on_ready_read)
+        self.reconnect_timer = QTimer(self)
+        self.reconnect_timer.setSingleShot(True)
+        self.reconnect_timer.timeout.connect(self._connect)
+        self._closed = False
+        self._loaded = False
+        self._catch_up_pending = False
+
+    def start(self):
+        """Запускает опрос по таймеру и подключается к концентратору."""
+        self.fallback_timer.start(FALLBACK_INTERVAL_MS)
+        self._connect()
+
+    def loaded(self):
+        """Отмечает, что окно применило первую загрузку данных; отложенное догоняющее уведомление отправляется сейчас."""
+        if self._loaded:
+            return
+        self._loaded = True
+        if self._catch_up_pending:
+            self._catch_up_pending = False
+            self.changed.emit(set(ALL_TABLES))
+
+    def close(self):
+        self._closed = True
+        self.reconnect_timer.stop()
+        self.socket.abort()
+
+    def _connect(self):
+        if self._closed or self.key is None or self.address is None:
+            return
+        if self.socket.state() == QAbstractSocket.UnconnectedState:
+            self.socket.connectToHost(*self.address)
+
+    def _on_connected(self):
+        self.socket.write(encode_message({'subscribe': self.key}))
+        self.fallback_timer.stop()
+        if self._loaded:
+            self.changed.emit(set(ALL_TABLES))
+        else:
+            # Первая загрузка еще выполняется и сама прочитает все данные
+            self._catch_up_pending = True
+
+    def _on_disconnected(self):
+        self._fall_back()
+
+    def _on_error(self, error):
+        if self.socket.state() != QAbstractSocket.ConnectedState:
+            self._fall_back()
+
+    def _fall_back(self):
+        if self._closed:
+            return
+        if not self.fallback_timer.isActive():
+            self.fallback_timer.start(FALLBACK_INTERVAL_MS)
+        if not self.reconnect_timer.isActive():
+            self.reconnect_timer.start(FALLBACK_INTERVAL_MS)
+
+    def _on_ready_read(self):
+        tables = set()
+        while self.socket.canReadLine():
+            line = bytes(self.socket.readLine())
+            try:
+                tables.update(json.loads(line)['tables'])
+            except (ValueError, KeyError, TypeError):
+                logger.warning('Некорректное уведомление: %r', line)
+        if tables:
+            self.changed.emit(tables)
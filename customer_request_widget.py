@@ -1,19 +1,19 @@
-from datetime import datetime
-
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QFormLayout, QComboBox, QScrollArea, QListWidgetItem
-from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QFormLayout, QComboBox, QScrollArea, QLineEdit
 from PyQt5.QtCore import QTimer
 
+from change_notifier import ChangeNotifier
+from dao.change_feed import ChangeFeed
+from dao.connection import thread_dao
 from dao.extra_work import ExtraWorkDAO
 from dao.type import ExtraWorkTypeDAO
-from dao.worker import WorkerDAO
+from list_sync import KeyedListSync
+from query_executor import QueryExecutor
+from request_format import STATUS_COLORS, format_customer_request
 
 
 class CustomerRequestWidget(QWidget):
 
-    extra_work_dao: ExtraWorkDAO
-    work_type_dao: ExtraWorkTypeDAO
-    worker_dao: WorkerDAO
+    executor: QueryExecutor
 
     def __init__(self, db_name='prod'):
         super().__init__()
@@ -21,22 +21,33 @@ class CustomerRequestWidget(QWidget):
         self.setWindowTitle("Заявки")
         self.setGeometry(100, 100, 600, 400)
 
-        # Инициализация DAO
-        self.extra_work_dao: ExtraWorkDAO  = ExtraWorkDAO(db_name)
-        self.work_type_dao: ExtraWorkTypeDAO = ExtraWorkTypeDAO(db_name)
-        self.worker_dao: WorkerDAO = WorkerDAO(db_name)
+        # Все запросы к базе данных выполняются в потоке исполнителя, DAO создаются в нем же
+        self.db_name = db_name
+        self.executor = QueryExecutor(self)
+        self.work_type_map = {}
 
         # Основной лейаут
         main_layout = QHBoxLayout()
 
         # Левый лейаут для списка заявок
         self.request_list = QListWidget()
+        self.request_sync = KeyedListSync(self.request_list)
+        self.request_feed = ChangeFeed(
+            lambda: self.dao(ExtraWorkDAO).get_extra_work_change_cursor(),
+            lambda: self.dao(ExtraWorkDAO).get_all_extra_work_details(),
+            lambda cursor: self.dao(ExtraWorkDAO).get_extra_work_details_changed_since(cursor)
+        )
         self.load_requests()
         main_layout.addWidget(self.request_list)
 
         # Правый лейаут для формы создания заявки
         form_layout = QFormLayout()
 
+        # Поиск по названию и описанию сужает список типов работ
+        self.work_type_search = QLineEdit()
+        self.work_type_search.setPlaceholderText("Поиск типа работы")
+        self.work_type_search.textChanged.connect(self.load_work_types)
+
         # QComboBox для выбора типа работы
         self.work_type_combo = QComboBox()
         self.work_type_combo.currentIndexChanged.connect(self.display_work_type_description)
@@ -52,6 +63,7 @@ class CustomerRequestWidget(QWidget):
         description_widget.setLayout(description_layout)
         scroll_area.setWidget(description_widget)
 
+        form_layout.addRow(QLabel("Поиск"), self.work_type_search)
         form_layout.addRow(QLabel("Тип работы"), self.work_type_combo)
         form_layout.addRow(QLabel("Описание"), scroll_area)
 
@@ -68,59 +80,55 @@ class CustomerRequestWidget(QWidget):
         # Загружаем типы работ после инициализации всех виджетов
         self.load_work_types()
 
-        # Устанавливаем таймер для автоматического обновления списка заявок
+        # Таймер опрашивает базу данных, только пока недоступен концентратор уведомлений
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.load_requests)
-        self.timer.start(4000)  # Обновление каждые 4000 миллисекунд (4 секунды)
+        self.notifier = ChangeNotifier(self.db_name, self.timer, self)
+        self.notifier.changed.connect(self.on_tables_changed)
+        self.notifier.start()
+
+    def dao(self, dao_class):
+        """Возвращает DAO потока исполнителя; вызывается только внутри запросов исполнителя."""
+        return thread_dao(dao_class, self.db_name)
+
+    def on_tables_changed(self, tables):
+        """Обновляет данные, зависящие от измененных таблиц."""
+        # Изменения типов работ, работников и должностей триггеры отмечают в журнале изменений заявок
+        if tables & {"extra_work", "extra_work_type", "worker", "post"}:
+            self.load_requests()
+        if "extra_work_type" in tables:
+            self.load_work_types()
 
     def load_requests(self):
-        """Загружает и отображает список всех заявок."""
-        requests = self.extra_work_dao.get_all_extra_works()
-        self.request_list.clear()
-        for request in requests:
-            extra_work_type_id = request[5]
-            work_type = self.work_type_dao.get_extra_work_type(extra_work_type_id)
-            work_type_name = work_type[3] if work_type else "Неизвестно"
-
-            item_text = f"ID: {request[0]}, Клиент ID: {request[7]}, Тип Работы: {work_type_name}, Статус: {request[6]}"
-
-            # Если работа в процессе, добавляем информацию о работнике
-            if request[6] == "in progress":
-                worker = self.worker_dao.get_worker(request[4])
-                if worker:
-                    worker_name = worker.full_name
-                    worker_post = worker.post.title
-                    item_text += f", Работник: {worker_name}, Квалификация: {worker_post}"
-
-            # Если работа завершена или оплачена, добавляем время выполнения
-            if request[6] in ["done", "paid"]:
-                start_time = datetime.strptime(request[2], '%Y-%m-%d %H:%M:%S')
-                end_time = datetime.strptime(request[3], '%Y-%m-%d %H:%M:%S')
-                duration = end_time - start_time
-                item_text += f", Время выполнения: {duration}"
-
-            item = QListWidgetItem(item_text)
-
-            # Устанавливаем цвет фона в зависимости от статуса
-            if request[6] == "pending":
-                item.setBackground(QColor("yellow"))
-            elif request[6] == "in progress":
-                item.setBackground(QColor("orange"))  # Изменяем цвет на оранжевый
-            elif request[6] == "done":
-                item.setBackground(QColor("green"))
-            elif request[6] == "paid":
-                item.setBackground(QColor("grey"))  # Цвет для оплаченной работы
-
-            self.request_list.addItem(item)
+        """Запрашивает изменения заявок в потоке исполнителя."""
+        self.executor.submit('requests', self.request_feed.fetch, self.show_requests)
+
+    def show_requests(self, batch):
+        """Применяет изменения заявок и обновляет в списке только затронутые строки."""
+        if not self.request_feed.apply(batch):
+            return
+        self.notifier.loaded()
+
+        self.request_sync.remove_many(self.request_feed.removed_ids)
+        for request_id in self.request_feed.changed_ids:
+            request = self.request_feed.rows[request_id]
+            self.request_sync.upsert(request_id, format_customer_request(request), STATUS_COLORS.get(request.status))
 
     def load_work_types(self):
-        """Загружает и отображает список всех типов работ."""
-        work_types = self.work_type_dao.get_all_extra_work_types()
+        """Загружает список типов работ: всех или найденных по строке поиска."""
+        text = self.work_type_search.text().strip()
+        if text:
+            query = lambda: self.dao(ExtraWorkTypeDAO).search_extra_work_types(text)
+        else:
+            query = lambda: self.dao(ExtraWorkTypeDAO).get_all_extra_work_types()
+        self.executor.submit('work_types', query, self.show_work_types)
+
+    def show_work_types(self, work_types):
         self.work_type_combo.clear()
         self.work_type_map = {}
         for work_type in work_types:
             # Используем поле type для отображения в QComboBox
-            work_type_display = work_type[3]  # Предполагаем, что поле type находится в work_type[3]
+            work_type_display = work_type.type
             self.work_type_combo.addItem(work_type_display)
             self.work_type_map[work_type_display] = work_type
 
@@ -133,7 +141,7 @@ class CustomerRequestWidget(QWidget):
         work_type_display = self.work_type_combo.itemText(index)
         work_type = self.work_type_map.get(work_type_display)
         if work_type:
-            self.work_type_description.setText(work_type[1])  # Отображаем описание
+            self.work_type_description.setText(work_type.description)  # Отображаем описание
 
     def send_request(self):
         """Создает новую заявку и сохраняет ее в базе данных."""
@@ -141,15 +149,25 @@ class CustomerRequestWidget(QWidget):
         work_type_display = self.work_type_combo.currentText()
         work_type = self.work_type_map.get(work_type_display)
         if work_type:
-            extra_work_type_id = work_type[0]
+            extra_work_type_id = work_type.id
             status = "pending"
-            self.extra_work_dao.create_extra_work(
-                type=work_type_display,
-                start_time=None,
-                end_time=None,
-                assignee=None,
-                extra_work_type_id=extra_work_type_id,
-                status=status,
-                client_id=client_id
+            self.executor.submit(
+                None,
+                lambda: self.dao(ExtraWorkDAO).create_extra_work(
+                    type=work_type_display,
+                    start_time=None,
+                    end_time=None,
+                    assignee=None,
+                    extra_work_type_id=extra_work_type_id,
+                    status=status,
+                    client_id=client_id
+                ),
+                lambda result: self.load_requests()
             )
-            self.load_requests()
\ No newline at end of file
+
+    def closeEvent(self, event):
+        """Останавливает обновление и закрывает соединения с базой данных при закрытии окна."""
+        self.timer.stop()
+        self.notifier.close()
+        self.executor.close()
+        event.accept()
@@ -0,0 +1,180 @@
+import asyncio
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import wraps
+
+from dao.analytics import AnalyticsDAO
+from dao.client import ClientDAO
+from dao.connection import thread_dao
+from dao.dashboard import DashboardDAO
+from dao.dispatch import DispatchDAO
+from dao.extra_work import ExtraWorkDAO
+from dao.type import ExtraWorkTypeDAO
+from dao.worker import WorkerDAO
+
+
+class AsyncDatabase:
+    """Выполняет вызовы синхронных DAO для asyncio: чтения в ограниченном пуле потоков, записи в одном потоке.
+
+    У каждого потока свое соединение, поэтому чтения в режиме WAL идут параллельно,
+    а записи выполняются строго по очереди и не ждут друг друга на блокировке базы.
+
+        database = AsyncDatabase('prod')
+        works = AsyncExtraWorkDAO(database)
+        pending, workers = await asyncio.gather(
+            works.get_extra_works_by_status('pending'),
+            AsyncWorkerDAO(database).get_worker_summaries(),
+        )
+    """
+
+    def __init__(self, db_name: str = 'prod', max_readers: int = 4):
+        self.db_name = db_name
+        self.readers = ThreadPoolExecutor(max_workers=max_readers, thread_name_prefix='db-reader')
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='db-writer')
+
+    async def read(self, dao_class, method_name: str, *args, **kwargs):
+        """Вызывает метод чтения DAO в пуле читателей."""
+        return await asyncio.wrap_future(self.submit('read', dao_class, method_name, args, kwargs))
+
+    async def write(self, dao_class, method_name: str, *args, **kwargs):
+        """Вызывает метод записи DAO в потоке писателя."""
+        return await asyncio.wrap_future(self.submit('write', dao_class, method_name, args, kwargs))
+
+    def submit(self, operation: str, dao_class, method_name: str, args=(), kwargs=None) -> Future:
+        """Ставит вызов метода DAO в пул читателей (operation='read') или писателю ('write') без asyncio."""
+        executor = self.writer if operation == 'write' else self.readers
+        return executor.submit(self._call, dao_class, method_name, args, kwargs or {})
+
+    def close(self):
+        """Дожидается начатых вызовов и останавливает потоки; их соединения закрываются вместе с потоками."""
+        self.readers.shutdown(wait=True)
+        self.writer.shutdown(wait=True)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, traceback):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    def _call(self, dao_class, method_name, args, kwargs):
+        # Пул сам работает с файлом базы данных, поэтому API_URL к нему не применяется
+        return getattr(thread_dao(dao_class, self.db_name, resolve=False), method_name)(*args, **kwargs)
+
+
+def _read(method):
+    """Асинхронная обертка метода чтения синхронного DAO."""
+    @wraps(method)
+    async def call(self, *args, **kwargs):
+        return await self.database.read(self.dao_class, method.__name__, *args, **kwargs)
+    call.operation = 'read'
+    return call
+
+
+def _write(method):
+    """Асинхронная обертка метода записи синхронного DAO."""
+    @wraps(method)
+    async def call(self, *args, **kwargs):
+        return await self.database.write(self.dao_class, method.__name__, *args, **kwargs)
+    call.operation = 'write'
+    return call
+
+
+class _AsyncDAO:
+    dao_class = None
+
+    def __init__(self, database: AsyncDatabase):
+        self.database = database
+
+    @classmethod
+    def operations(cls):
+        """Возвращает {имя метода: 'read' | 'write'} для всех операций DAO."""
+        return {
+            name: value.operation
+            for name, value in vars(cls).items()
+            if callable(value) and hasattr(value, 'operation')
+        }
+
+
+class AsyncExtraWorkDAO(_AsyncDAO):
+    dao_class = ExtraWorkDAO
+
+    create_extra_work = _write(ExtraWorkDAO.create_extra_work)
+    create_extra_works_many = _write(ExtraWorkDAO.create_extra_works_many)
+    get_extra_work = _read(ExtraWorkDAO.get_extra_work)
+    get_all_extra_works = _read(ExtraWorkDAO.get_all_extra_works)
+    find_extra_works = _read(ExtraWorkDAO.find_extra_works)
+    get_extra_works_by_status = _read(ExtraWorkDAO.get_extra_works_by_status)
+    get_extra_work_details = _read(ExtraWorkDAO.get_extra_work_details)
+    get_all_extra_work_details = _read(ExtraWorkDAO.get_all_extra_work_details)
+    get_extra_work_details_page = _read(ExtraWorkDAO.get_extra_work_details_page)
+    get_extra_work_change_cursor = _read(ExtraWorkDAO.get_extra_work_change_cursor)
+    get_extra_works_changed_since = _read(ExtraWorkDAO.get_extra_works_changed_since)
+    get_extra_work_details_changed_since = _read(ExtraWorkDAO.get_extra_work_details_changed_since)
+    update_extra_work = _write(ExtraWorkDAO.update_extra_work)
+    update_extra_works_status_many = _write(ExtraWorkDAO.update_extra_works_status_many)
+    delete_extra_work = _write(ExtraWorkDAO.delete_extra_work)
+    delete_extra_works_many = _write(ExtraWorkDAO.delete_extra_works_many)
+    archive_paid_extra_works = _write(ExtraWorkDAO.archive_paid_extra_works)
+    # last_insert_rowid привязан к соединению, поэтому читается в потоке писателя
+    get_last_inserted_id = _write(ExtraWorkDAO.get_last_inserted_id)
+
+
+class AsyncWorkerDAO(_AsyncDAO):
+    dao_class = WorkerDAO
+
+    get_worker = _read(WorkerDAO.get_worker)
+    get_worker_by_name = _read(WorkerDAO.get_worker_by_name)
+    get_all_workers = _read(WorkerDAO.get_all_workers)
+    get_worker_names = _read(WorkerDAO.get_worker_names)
+    get_worker_summaries = _read(WorkerDAO.get_worker_summaries)
+    search_workers = _read(WorkerDAO.search_workers)
+    get_duties_by_post = _read(WorkerDAO.get_duties_by_post)
+    update_worker_balance = _write(WorkerDAO.update_worker_balance)
+
+
+class AsyncClientDAO(_AsyncDAO):
+    dao_class = ClientDAO
+
+    create_client = _write(ClientDAO.create_client)
+    create_clients_many = _write(ClientDAO.create_clients_many)
+    create_client_with_id = _write(ClientDAO.create_client_with_id)
+    get_client = _read(ClientDAO.get_client)
+    get_all_clients = _read(ClientDAO.get_all_clients)
+    search_clients = _read(ClientDAO.search_clients)
+    update_client = _write(ClientDAO.update_client)
+    delete_client = _write(ClientDAO.delete_client)
+
+
+class AsyncExtraWorkTypeDAO(_AsyncDAO):
+    dao_class = ExtraWorkTypeDAO
+
+    create_extra_work_type = _write(ExtraWorkTypeDAO.create_extra_work_type)
+    create_extra_work_types_many = _write(ExtraWorkTypeDAO.create_extra_work_types_many)
+    get_extra_work_type = _read(ExtraWorkTypeDAO.get_extra_work_type)
+    get_all_extra_work_types = _read(ExtraWorkTypeDAO.get_all_extra_work_types)
+    search_extra_work_types = _read(ExtraWorkTypeDAO.search_extra_work_types)
+    update_extra_work_type = _write(ExtraWorkTypeDAO.update_extra_work_type)
+    delete_extra_work_type = _write(ExtraWorkTypeDAO.delete_extra_work_type)
+
+
+class AsyncDashboardDAO(_AsyncDAO):
+    dao_class = DashboardDAO
+
+    get_status_summary = _read(DashboardDAO.get_status_summary)
+    get_outstanding_amount = _read(DashboardDAO.get_outstanding_amount)
+    get_worker_totals = _read(DashboardDAO.get_worker_totals)
+
+
+class AsyncAnalyticsDAO(_AsyncDAO):
+    dao_class = AnalyticsDAO
+
+    get_completion_times_by_work_type = _read(AnalyticsDAO.get_completion_times_by_work_type)
+    get_completion_times_by_worker = _read(AnalyticsDAO.get_completion_times_by_worker)
+    get_daily_throughput = _read(AnalyticsDAO.get_daily_throughput)
+
+
+class AsyncDispatchDAO(_AsyncDAO):
+    dao_class = DispatchDAO
+
+    get_post_work_types = _read(DispatchDAO.get_post_work_types)
+    set_post_work_types = _write(DispatchDAO.set_post_work_types)
+    auto_dispatch = _write(DispatchDAO.auto_dispatch)
@@ -0,0 +1,88 @@
+from typing import List
+
+from dao.connection import get_connection, release_connection
+from dao.extra_work import DURATION_SECONDS, extra_work_source
+from entity.analytics import CompletionTimes, DailyThroughput
+
+
+# Заявки, которые считаются завершенными
+COMPLETED_STATUSES = "('done', 'paid')"
+
+# Группировка для перцентилей: столбец ключа в extra_work и соединение, из которого берется имя группы
+_GROUPS = {
+    'work_type': ('e.extra_work_type_id', 'LEFT JOIN extra_work_type g ON g.id = d.key_id', 'g.type'),
+    'worker': ('e.assignee', 'LEFT JOIN worker g ON g.id = d.key_id', 'g.full_name'),
+}
+
+
+def _rank_at(percent: int) -> str:
+    """Значение с рангом ceil(percent% * n) в упорядоченной группе (метод ближайшего ранга)."""
+    return f'MIN(CASE WHEN d.rank * 100 >= {percent} * d.total THEN d.duration END)'
+
+
+class AnalyticsDAO:
+    """Статистика по завершенным заявкам за период; каждая выборка - один агрегирующий запрос.
+
+    Период задается по времени завершения: date_from включительно, date_to не включительно,
+    в формате 'ГГГГ-ММ-ДД' или 'ГГГГ-ММ-ДД ЧЧ:ММ:СС'. По умолчанию учитываются и архивные заявки.
+    """
+
+    def __init__(self, db_name='prod'):
+        self.db_name = db_name
+        self.connection = get_connection(db_name)
+        self.times_cursor = self.connection.cursor()
+        self.times_cursor.row_factory = CompletionTimes.row_factory
+        self.throughput_cursor = self.connection.cursor()
+        self.throughput_cursor.row_factory = DailyThroughput.row_factory
+
+    def get_completion_times_by_work_type(self, date_from: str, date_to: str,
+                                          include_archive: bool = True) -> List[CompletionTimes]:
+        """Возвращает время выполнения заявок по каждому типу работы."""
+        return self._get_completion_times('work_type', date_from, date_to, include_archive)
+
+    def get_completion_times_by_worker(self, date_from: str, date_to: str,
+                                       include_archive: bool = True) -> List[CompletionTimes]:
+        """Возвращает время выполнения заявок по каждому работнику."""
+        return self._get_completion_times('worker', date_from, date_to, include_archive)
+
+    def _get_completion_times(self, group: str, date_from: str, date_to: str,
+                              include_archive: bool) -> List[CompletionTimes]:
+        key, join, name = _GROUPS[group]
+        # Оконные функции нумеруют длительности внутри группы, после чего перцентили
+        # выбираются одним проходом GROUP BY без загрузки длительностей в Python
+        self.times_cursor.execute(f'''
+            WITH d AS (
+                SELECT {key} AS key_id, {DURATION_SECONDS} AS duration,
+                       ROW_NUMBER() OVER (PARTITION BY {key} ORDER BY {DURATION_SECONDS}) AS rank,
+                       COUNT(*) OVER (PARTITION BY {key}) AS total
+                FROM {extra_work_source(include_archive)} e
+                WHERE e.status IN {COMPLETED_STATUSES}
+                  AND e.end_time >= ? AND e.end_time < ?
+                  AND e.start_time IS NOT NULL AND {key} IS NOT NULL
+            )
+            SELECT d.key_id, {name}, COUNT(*), AVG(d.duration),
+                   {_rank_at(50)}, {_rank_at(90)}, {_rank_at(99)}, MAX(d.duration)
+            FROM d
+            {join}
+            GROUP BY d.key_id
+            ORDER BY d.key_id
+        ''', (date_from, date_to))
+        return self.times_cursor.fetchall()
+
+    def get_daily_throughput(self, date_from: str, date_to: str,
+                             include_archive: bool = True) -> List[DailyThroughput]:
+        """Возвращает по дням число завершенных заявок и сумму оплаты по ним."""
+        self.throughput_cursor.execute(f'''
+            SELECT date(e.end_time) AS day, COUNT(*), COALESCE(SUM(t.payment), 0)
+            FROM {extra_work_source(include_archive)} e
+            LEFT JOIN extra_work_type t ON t.id = e.extra_work_type_id
+            WHERE e.status IN {COMPLETED_STATUSES}
+              AND e.end_time >= ? AND e.end_time < ?
+            GROUP BY day
+            ORDER BY day
+        ''', (date_from, date_to))
+        return self.throughput_cursor.fetchall()
+
+    def close(self):
+        """Освобождает общее соединение с базой данных."""
+        release_connection(self.db_name)
@@ -0,0 +1,53 @@
+import sqlite3
+from itertools import islice
+from typing import Iterable, Iterator, List, Sequence
+
+
+# Количество строк в одной транзакции пакетной записи
+CHUNK_SIZE = 5000
+
+
+def chunked(rows: Iterable[Sequence], size: int = CHUNK_SIZE) -> Iterator[List[Sequence]]:
+    """Разбивает поток строк на списки не длиннее size, не загружая весь поток в память."""
+    iterator = iter(rows)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def insert_many(connection: sqlite3.Connection, sql: str, rows: Iterable[Sequence],
+                chunk_size: int = CHUNK_SIZE) -> List[int]:
+    """Вставляет строки через executemany, по одной транзакции на пачку. Возвращает ID вставленных строк."""
+    ids = []
+    cursor = connection.cursor()
+    for chunk in chunked(rows, chunk_size):
+        # Пока транзакция держит блокировку записи, автоинкрементные ID пачки идут подряд
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.executemany(sql, chunk)
+            last_id = cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        ids.extend(range(last_id - len(chunk) + 1, last_id + 1))
+    return ids
+
+
+def execute_many(connection: sqlite3.Connection, sql: str, rows: Iterable[Sequence],
+                 chunk_size: int = CHUNK_SIZE) -> int:
+    """Выполняет INSERT/UPDATE/DELETE для каждой строки пачками в отдельных транзакциях. Возвращает число измененных строк."""
+    changed = 0
+    cursor = connection.cursor()
+    for chunk in chunked(rows, chunk_size):
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            cursor.executemany(sql, chunk)
+            changed += cursor.rowcount
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+    return changed
@@ -0,0 +1,110 @@
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Optional, TypeVar
+
+
+T = TypeVar('T')
+
+
+class VersionedCache(Generic[T]):
+    """Общий для процесса кэш справочника, который перечитывается при смене его версии в базе.
+
+    Версия справочника хранится в таблице catalog_version и увеличивается триггерами.
+    Чтобы не читать ее при каждом обращении, сначала проверяется PRAGMA data_version
+    соединения: он меняется только после записи в базу другими соединениями.
+    Собственные записи соединения сбрасывают кэш через invalidate().
+    """
+
+    def __init__(self, name: str, load: Callable[[sqlite3.Cursor], T]):
+        self.name = name
+        self.load = load
+        self.lock = threading.Lock()
+        self.value: Optional[T] = None
+        self.version: Optional[int] = None
+        # Увеличивается при invalidate(), чтобы остальные DAO процесса перепроверили версию
+        self.generation = 0
+
+    def get(self, cursor: sqlite3.Cursor, seen: Dict) -> T:
+        """Возвращает актуальное значение; seen хранит состояние проверок для конкретного соединения."""
+        data_version = cursor.execute('PRAGMA data_version').fetchone()[0]
+        if (self.value is not None and seen.get('data_version') == data_version
+                and seen.get('generation') == self.generation):
+            return self.value
+
+        with self.lock:
+            generation = self.generation
+            version = cursor.execute(
+                'SELECT version FROM catalog_version WHERE name = ?', (self.name,)
+            ).fetchone()[0]
+            if self.value is None or self.version != version:
+                self.value = self.load(cursor)
+                self.version = version
+            seen['data_version'] = data_version
+            seen['generation'] = generation
+            return self.value
+
+    def invalidate(self):
+        """Сбрасывает кэш после записи в справочник."""
+        with self.lock:
+            self.value = None
+            self.version = None
+            self.generation += 1
+
+
+_caches: Dict[tuple, VersionedCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_versioned_cache(database_key: str, name: str, load: Callable[[sqlite3.Cursor], T]) -> VersionedCache[T]:
+    """Возвращает общий для процесса кэш справочника name базы database_key."""
+    with _caches_lock:
+        cache = _caches.get((database_key, name))
+        if cache is None:
+            cache = _caches[(database_key, name)] = VersionedCache(name, load)
+        return cache
+
+
+class LRUCache:
+    """Потокобезопасный кэш объектов по ключу с ограничением размера (LRU) и временем жизни записей."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self._entries: OrderedDict = OrderedDict()
+
+    def get(self, key):
+        """Возвращает объект по ключу или None, если его нет или срок его жизни истек."""
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key, value):
+        """Сохраняет объект; при переполнении вытесняет давно не использованные записи."""
+        with self.lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        """Удаляет объект по ключу."""
+        with self.lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        """Удаляет все объекты."""
+        with self.lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,73 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+class ChangeFeed:
+    """Локальная копия записей, которая обновляется только изменениями после курсора."""
+
+    def __init__(self,
+                 get_cursor: Callable[[], int],
+                 load_all: Callable[[], Iterable[Tuple]],
+                 load_changes: Callable[[int], Tuple[int, List[Tuple], List[int]]],
+                 predicate: Optional[Callable[[Tuple], bool]] = None):
+        self.get_cursor = get_cursor
+        self.load_all = load_all
+        self.load_changes = load_changes
+        self.predicate = predicate
+        self.cursor: Optional[int] = None
+        self.rows: Dict[int, Tuple] = {}
+        # ID записей, добавленных или измененных и удаленных при последнем вызове poll
+        self.changed_ids: List[int] = []
+        self.removed_ids: List[int] = []
+
+    def poll(self) -> bool:
+        """Применяет изменения после курсора. Возвращает True, если записи изменились."""
+        return self.apply(self.fetch())
+
+    def fetch(self) -> Tuple:
+        """Читает изменения после текущего курсора, не меняя состояние ленты.
+
+        Может выполняться в другом потоке; результат передается в apply.
+        """
+        if self.cursor is None:
+            # Курсор фиксируется до чтения таблицы, чтобы не пропустить параллельные изменения
+            cursor = self.get_cursor()
+            return None, cursor, list(self.load_all()), []
+        new_cursor, changed, deleted = self.load_changes(self.cursor)
+        return self.cursor, new_cursor, changed, deleted
+
+    def apply(self, batch: Tuple) -> bool:
+        """Применяет результат fetch. Возвращает True, если записи изменились.
+
+        Результат, прочитанный от устаревшего курсора, игнорируется.
+        """
+        base_cursor, new_cursor, changed, deleted = batch
+        if base_cursor != self.cursor:
+            return False
+
+        self.changed_ids = []
+        self.removed_ids = []
+        self.cursor = new_cursor
+
+        if base_cursor is None:
+            self.rows = {row.id: row for row in changed if self._accepts(row)}
+            self.changed_ids = sorted(self.rows)
+            return True
+
+        for row in changed:
+            if self._accepts(row):
+                if self.rows.get(row.id) != row:
+                    self.rows[row.id] = row
+                    self.changed_ids.append(row.id)
+            elif self.rows.pop(row.id, None) is not None:
+                self.removed_ids.append(row.id)
+        for row_id in deleted:
+            if self.rows.pop(row_id, None) is not None:
+                self.removed_ids.append(row_id)
+        return bool(self.changed_ids or self.removed_ids)
+
+    def sorted_rows(self) -> List[Tuple]:
+        """Возвращает записи, упорядоченные по ID."""
+        return [self.rows[row_id] for row_id in sorted(self.rows)]
+
+    def _accepts(self, row: Tuple) -> bool:
+        return self.predicate is None or self.predicate(row)
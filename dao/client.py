@@ -1,23 +1,22 @@
-import sqlite3
+from typing import Iterable, List, Optional, Tuple
+
+from dao.bulk import insert_many
+from dao.connection import get_connection, release_connection
+from dao.notifications import notify
+from dao.search import SEARCH_LIMIT, prefix_query
+from entity.client import Client
+
+
+CLIENT_COLUMNS = 'id, first_name, last_name, phone_number'
 
 
 class ClientDAO:
     def __init__(self, db_name="prod"):
-        self.connection = sqlite3.connect(db_name)
+        self.db_name = db_name
+        self.connection = get_connection(db_name)
         self.cursor = self.connection.cursor()
-        self.create_table()
-
-    def create_table(self):
-        """Создает таблицу client, если она не существует."""
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS client (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                first_name TEXT,
-                last_name TEXT,
-                phone_number TEXT
-            )
-        ''')
-        self.connection.commit()
+        self.client_cursor = self.connection.cursor()
+        self.client_cursor.row_factory = Client.row_factory
 
     def create_client(self, first_name, last_name, phone_number):
         """Создает новую запись клиента в таблице."""
@@ -26,6 +25,18 @@ class ClientDAO:
             VALUES (?, ?, ?)
         ''', (first_name, last_name, phone_number))
         self.connection.commit()
+        notify(self.db_name, 'client')
+
+    def create_clients_many(self, clients: Iterable[Tuple[str, str, str]]) -> List[int]:
+        """Пакетно создает клиентов из кортежей (first_name, last_name, phone_number). Возвращает их ID."""
+        try:
+            return insert_many(self.connection, '''
+                INSERT INTO client (first_name, last_name, phone_number)
+                VALUES (?, ?, ?)
+            ''', clients)
+        finally:
+            # Часть пачек могла быть записана и до ошибки
+            notify(self.db_name, 'client')
 
     def create_client_with_id(self, id, first_name, last_name, phone_number):
         """Создает новую запись клиента в таблице."""
@@ -34,16 +45,32 @@ class ClientDAO:
             VALUES (?, ?, ?, ?)
         ''', (id ,first_name, last_name, phone_number))
         self.connection.commit()
+        notify(self.db_name, 'client')
 
-    def get_client(self, client_id):
+    def get_client(self, client_id) -> Optional[Client]:
         """Возвращает запись клиента по ID."""
-        self.cursor.execute('SELECT * FROM client WHERE id = ?', (client_id,))
-        return self.cursor.fetchone()
+        self.client_cursor.execute(f'SELECT {CLIENT_COLUMNS} FROM client WHERE id = ?', (client_id,))
+        return self.client_cursor.fetchone()
 
-    def get_all_clients(self):
+    def get_all_clients(self) -> List[Client]:
         """Возвращает все записи клиентов."""
-        self.cursor.execute('SELECT * FROM client')
-        return self.cursor.fetchall()
+        self.client_cursor.execute(f'SELECT {CLIENT_COLUMNS} FROM client')
+        return self.client_cursor.fetchall()
+
+    def search_clients(self, text: str, limit: int = SEARCH_LIMIT) -> List[Client]:
+        """Ищет клиентов по началу слов имени, фамилии или номера телефона, по релевантности."""
+        query = prefix_query(text)
+        if query is None:
+            return []
+        self.client_cursor.execute('''
+            SELECT c.id, c.first_name, c.last_name, c.phone_number
+            FROM client_fts f
+            JOIN client c ON c.id = f.rowid
+            WHERE client_fts MATCH ?
+            ORDER BY bm25(client_fts)
+            LIMIT ?
+        ''', (query, limit))
+        return self.client_cursor.fetchall()
 
     def update_client(self, client_id, first_name=None, last_name=None, phone_number=None):
         """Обновляет запись клиента по ID."""
@@ -69,12 +96,14 @@ class ClientDAO:
                 WHERE id = ?
             ''', values)
             self.connection.commit()
+            notify(self.db_name, 'client')
 
     def delete_client(self, client_id):
         """Удаляет запись клиента по ID."""
         self.cursor.execute('DELETE FROM client WHERE id = ?', (client_id,))
         self.connection.commit()
+        notify(self.db_name, 'client')
 
     def close(self):
-        """Закрывает соединение с базой данных."""
-        self.connection.close()
+        """Освобождает общее соединение с базой данных."""
+        release_connection(self.db_name)
@@ -0,0 +1,124 @@
+import os
+import sqlite3
+import threading
+
+from dao import instrumentation
+from dao.migrations import migrate
+
+
+# Сколько миллисекунд ждать освобождения блокировки другим процессом, прежде чем вернуть "database is locked"
+BUSY_TIMEOUT_MS = int(os.environ.get('MIS_DB_BUSY_TIMEOUT_MS', 5000))
+JOURNAL_MODE = os.environ.get('MIS_DB_JOURNAL_MODE', 'WAL')
+# Адрес сервера server.py; если задан, thread_dao создает клиентские DAO, которые обращаются к нему по HTTP
+API_URL = os.environ.get('MIS_API_URL') or None
+
+_local = threading.local()
+_schema_lock = threading.Lock()
+
+
+def configure(busy_timeout_ms: int = None, journal_mode: str = None, api_url: str = None):
+    """Меняет параметры для соединений и DAO, которые будут открыты после вызова.
+
+    Пустая строка в api_url возвращает прямую работу с базой данных.
+    """
+    global BUSY_TIMEOUT_MS, JOURNAL_MODE, API_URL
+    if busy_timeout_ms is not None:
+        BUSY_TIMEOUT_MS = busy_timeout_ms
+    if journal_mode is not None:
+        JOURNAL_MODE = journal_mode
+    if api_url is not None:
+        API_URL = api_url or None
+
+
+def connect(db_name: str) -> sqlite3.Connection:
+    """Открывает новое настроенное соединение и один раз за процесс обновляет схему базы данных."""
+    connection = sqlite3.connect(db_name, timeout=BUSY_TIMEOUT_MS / 1000,
+                                 factory=instrumentation.connection_factory())
+    connection.execute(f'PRAGMA busy_timeout = {int(BUSY_TIMEOUT_MS)}')
+    if db_name != ':memory:':
+        # WAL позволяет читателям не блокировать писателя и друг друга
+        connection.execute(f'PRAGMA journal_mode = {JOURNAL_MODE}')
+        if JOURNAL_MODE.upper() == 'WAL':
+            connection.execute('PRAGMA synchronous = NORMAL')
+    ensure_schema(connection)
+    return connection
+
+
+def ensure_schema(connection: sqlite3.Connection):
+    """Применяет недостающие миграции схемы.
+
+    Проверяется каждое новое соединение: файл базы мог быть удален и создан заново,
+    а для актуальной схемы проверка - одно чтение PRAGMA user_version.
+    """
+    # Потоки процесса не ждут друг друга на блокировке записи базы во время миграции
+    with _schema_lock:
+        migrate(connection)
+
+
+def get_connection(db_name: str) -> sqlite3.Connection:
+    """Возвращает общее для текущего потока соединение с базой данных."""
+    connections = _thread_connections()
+    entry = connections.get(db_name)
+    if entry is None:
+        entry = connections[db_name] = [connect(db_name), 0]
+    entry[1] += 1
+    return entry[0]
+
+
+def release_connection(db_name: str):
+    """Освобождает соединение; закрывает его, когда им больше не пользуется ни один DAO потока."""
+    connections = _thread_connections()
+    entry = connections.get(db_name)
+    if entry is None:
+        return
+    entry[1] -= 1
+    if entry[1] <= 0:
+        del connections[db_name]
+        entry[0].close()
+
+
+def thread_dao(dao_class, db_name: str, resolve: bool = True):
+    """Возвращает DAO класса dao_class, принадлежащий текущему потоку; создает его при первом обращении.
+
+    При resolve=False всегда используется сам dao_class, даже если задан API_URL.
+    """
+    if resolve:
+        dao_class = resolve_dao_class(dao_class)
+    daos = getattr(_local, 'daos', None)
+    if daos is None:
+        daos = _local.daos = {}
+    dao = daos.get((dao_class, db_name))
+    if dao is None:
+        dao = daos[(dao_class, db_name)] = dao_class(db_name)
+    return dao
+
+
+def resolve_dao_class(dao_class):
+    """Возвращает класс DAO с учетом настроек: сам dao_class или его HTTP-клиент, если задан API_URL."""
+    if API_URL is None:
+        return dao_class
+    # Импорт здесь, потому что модуль клиента сам зависит от этого модуля
+    from dao.http_client import remote_dao_class
+    return remote_dao_class(dao_class)
+
+
+def close_thread_daos():
+    """Закрывает все DAO, созданные через thread_dao в текущем потоке."""
+    daos = getattr(_local, 'daos', {})
+    for dao in daos.values():
+        dao.close()
+    daos.clear()
+
+
+def database_key(db_name: str, connection: sqlite3.Connection) -> str:
+    """Возвращает ключ базы данных для общих кэшей процесса: путь к файлу или соединение базы в памяти."""
+    # У каждой базы в памяти свои данные, поэтому ключом служит ее соединение
+    if db_name == ':memory:':
+        return f':memory:{id(connection)}'
+    return os.path.abspath(db_name)
+
+
+def _thread_connections() -> dict:
+    if not hasattr(_local, 'connections'):
+        _local.connections = {}
+    return _local.connections
@@ -0,0 +1,44 @@
+from typing import Dict, List
+
+from dao.connection import get_connection, release_connection
+from entity.dashboard import StatusSummary, WorkerTotals
+
+
+class DashboardDAO:
+    """Чтение сводных таблиц, которые триггеры поддерживают в актуальном состоянии."""
+
+    def __init__(self, db_name='prod'):
+        self.db_name = db_name
+        self.connection = get_connection(db_name)
+        self.cursor = self.connection.cursor()
+        self.status_cursor = self.connection.cursor()
+        self.status_cursor.row_factory = StatusSummary.row_factory
+        self.worker_cursor = self.connection.cursor()
+        self.worker_cursor.row_factory = WorkerTotals.row_factory
+
+    def get_status_summary(self) -> Dict[str, StatusSummary]:
+        """Возвращает число заявок и сумму оплаты по каждому статусу."""
+        self.status_cursor.execute('SELECT status, count, amount FROM extra_work_status_summary WHERE count != 0')
+        return {summary.status: summary for summary in self.status_cursor.fetchall()}
+
+    def get_outstanding_amount(self) -> float:
+        """Возвращает сумму к оплате по выполненным, но не оплаченным заявкам."""
+        self.cursor.execute("SELECT amount FROM extra_work_status_summary WHERE status = 'done'")
+        row = self.cursor.fetchone()
+        return row[0] if row else 0.0
+
+    def get_worker_totals(self) -> List[WorkerTotals]:
+        """Возвращает итоги по каждому работнику, у которого есть назначенные заявки."""
+        self.worker_cursor.execute('''
+            SELECT s.worker_id, w.full_name, s.in_progress_count, s.done_count, s.paid_count,
+                   s.unpaid_amount, s.earned_amount
+            FROM worker_work_summary s
+            JOIN worker w ON w.id = s.worker_id
+            WHERE s.in_progress_count != 0 OR s.done_count != 0 OR s.paid_count != 0
+            ORDER BY w.full_name
+        ''')
+        return self.worker_cursor.fetchall()
+
+    def close(self):
+        """Освобождает общее соединение с базой данных."""
+        release_connection(self.db_name)
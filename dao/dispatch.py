@@ -0,0 +1,125 @@
+import heapq
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from dao.connection import get_connection, release_connection
+from dao.notifications import notify
+
+
+class _LoadQueue:
+    """Очередь работников по возрастанию нагрузки.
+
+    Одни и те же работники лежат в нескольких кучах (общей и куче своей должности),
+    поэтому устаревшие записи не удаляются сразу, а пропускаются при чтении вершины.
+    """
+
+    def __init__(self, load: Dict[int, int]):
+        self.load = load
+        self.heap: List[Tuple[int, int]] = []
+
+    def push(self, worker_id: int):
+        heapq.heappush(self.heap, (self.load[worker_id], worker_id))
+
+    def peek(self) -> Optional[Tuple[int, int]]:
+        heap = self.heap
+        while heap and heap[0][0] != self.load[heap[0][1]]:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+
+class DispatchDAO:
+    def __init__(self, db_name='prod'):
+        self.db_name = db_name
+        self.connection = get_connection(db_name)
+        self.cursor = self.connection.cursor()
+
+    def get_post_work_types(self) -> Dict[int, Set[int]]:
+        """Возвращает {ID должности: ID типов работ, которые могут выполнять работники на ней}."""
+        self.cursor.execute('SELECT post_id, extra_work_type_id FROM post_work_type')
+        post_work_types = defaultdict(set)
+        for post_id, extra_work_type_id in self.cursor.fetchall():
+            post_work_types[post_id].add(extra_work_type_id)
+        return post_work_types
+
+    def set_post_work_types(self, post_id: int, extra_work_type_ids: Iterable[int]):
+        """Заменяет набор типов работ, которые могут выполнять работники на должности."""
+        self.cursor.execute('DELETE FROM post_work_type WHERE post_id = ?', (post_id,))
+        self.cursor.executemany(
+            'INSERT INTO post_work_type (post_id, extra_work_type_id) VALUES (?, ?)',
+            ((post_id, extra_work_type_id) for extra_work_type_id in set(extra_work_type_ids))
+        )
+        self.connection.commit()
+        notify(self.db_name, 'post_work_type')
+
+    def auto_dispatch(self) -> List[Tuple[int, int]]:
+        """Назначает все заявки pending наименее загруженным подходящим работникам в одной транзакции.
+
+        Нагрузка работника - число его заявок в работе. Подходят работники, чьей должности
+        разрешен тип работы; если тип не закреплен ни за одной должностью, подходят все.
+        Возвращает пары (ID заявки, ID работника).
+        """
+        cursor = self.cursor
+        # Блокировка записи берется до чтения, чтобы заявки и нагрузка не изменились до обновления
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            assignments = self._plan(cursor)
+            start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            cursor.executemany('''
+                UPDATE extra_work
+                SET status = 'in progress', assignee = ?, start_time = ?
+                WHERE id = ? AND status = 'pending'
+            ''', ((worker_id, start_time, work_id) for work_id, worker_id in assignments))
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+        if assignments:
+            notify(self.db_name, 'extra_work')
+        return assignments
+
+    def _plan(self, cursor) -> List[Tuple[int, int]]:
+        cursor.execute('''
+            SELECT w.id, w.post_id, COALESCE(s.in_progress_count, 0)
+            FROM worker w
+            LEFT JOIN worker_work_summary s ON s.worker_id = w.id
+        ''')
+        load: Dict[int, int] = {}
+        everyone = _LoadQueue(load)
+        post_queues: Dict[int, _LoadQueue] = {}
+        worker_queues: Dict[int, Tuple[_LoadQueue, ...]] = {}
+        for worker_id, post_id, in_progress_count in cursor.fetchall():
+            load[worker_id] = in_progress_count
+            if post_id is None:
+                worker_queues[worker_id] = (everyone,)
+            else:
+                worker_queues[worker_id] = (everyone, post_queues.setdefault(post_id, _LoadQueue(load)))
+            for queue in worker_queues[worker_id]:
+                queue.push(worker_id)
+
+        # Типы работ, закрепленные за должностями, и очереди работников этих должностей
+        restricted: Dict[int, List[_LoadQueue]] = defaultdict(list)
+        cursor.execute('SELECT post_id, extra_work_type_id FROM post_work_type')
+        for post_id, extra_work_type_id in cursor.fetchall():
+            queues = restricted[extra_work_type_id]
+            if post_id in post_queues:
+                queues.append(post_queues[post_id])
+
+        cursor.execute("SELECT id, extra_work_type_id FROM extra_work WHERE status = 'pending' ORDER BY id")
+        assignments = []
+        for work_id, extra_work_type_id in cursor.fetchall():
+            queues = restricted.get(extra_work_type_id, (everyone,))
+            best = min(filter(None, (queue.peek() for queue in queues)), default=None)
+            if best is None:
+                # Нет работников, которым разрешен этот тип работы
+                continue
+            worker_id = best[1]
+            load[worker_id] += 1
+            for queue in worker_queues[worker_id]:
+                queue.push(worker_id)
+            assignments.append((work_id, worker_id))
+        return assignments
+
+    def close(self):
+        """Освобождает общее соединение с базой данных."""
+        release_connection(self.db_name)
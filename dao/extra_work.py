@@ -1,28 +1,54 @@
-import sqlite3
-from typing import List, Tuple, Optional
+from datetime import datetime
+from typing import Iterable, List, Tuple, Optional
+
+from dao.bulk import insert_many, execute_many
+from dao.connection import get_connection, release_connection
+from dao.notifications import notify
+from entity.extra_work import ExtraWork, ExtraWorkDetails
+
+
+EXTRA_WORK_COLUMNS = '''
+    e.id, e.type, e.start_time, e.end_time, e.assignee, e.extra_work_type_id, e.status, e.client_id
+'''
+# Время выполнения заявки e в секундах; NULL, пока заявка не начата или не завершена
+DURATION_SECONDS = 'CAST(ROUND((julianday(e.end_time) - julianday(e.start_time)) * 86400) AS INTEGER)'
+# Заявка вместе с названием типа работы, оплатой, именем исполнителя, его должностью и временем выполнения
+EXTRA_WORK_DETAILS_COLUMNS = f'''
+    e.id, e.type, e.start_time, e.end_time, e.assignee, e.extra_work_type_id, e.status, e.client_id,
+    t.type, t.payment, w.full_name, p.title, {DURATION_SECONDS}
+'''
+EXTRA_WORK_DETAILS_JOINS = '''
+    LEFT JOIN extra_work_type t ON t.id = e.extra_work_type_id
+    LEFT JOIN worker w ON w.id = e.assignee
+    LEFT JOIN post p ON p.id = w.post_id
+'''
+
+# Сколько заявок переносится в архив за одну транзакцию
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def extra_work_source(include_archive: bool) -> str:
+    """Таблица для чтения заявок: только рабочая или вместе с архивом."""
+    return 'extra_work_history' if include_archive else 'extra_work'
+
+
+def _changes_row_factory(entity_class):
+    """Фабрика строк журнала изменений: (ID заявки, заявка или None, если она удалена)."""
+    def row_factory(cursor, row):
+        return row[0], entity_class(*row[1:]) if row[1] is not None else None
+    return row_factory
 
 
 class ExtraWorkDAO:
     def __init__(self, db_name='prod'):
-        self.connection = sqlite3.connect(db_name)
+        self.db_name = db_name
+        self.connection = get_connection(db_name)
         self.cursor = self.connection.cursor()
-        self.create_table()
-
-    def create_table(self):
-        """Создает таблицу extra_work, если она не существует."""
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS extra_work (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                type TEXT,
-                start_time DATETIME,
-                end_time DATETIME,
-                assignee INTEGER REFERENCES worker(id),
-                extra_work_type_id INTEGER REFERENCES extra_work_type(id),
-                status TEXT,
-                client_id INTEGER REFERENCES client(id)
-            )
-        ''')
-        self.connection.commit()
+        # Отдельные курсоры сразу собирают строки в объекты ExtraWork и ExtraWorkDetails
+        self.work_cursor = self.connection.cursor()
+        self.work_cursor.row_factory = ExtraWork.row_factory
+        self.details_cursor = self.connection.cursor()
+        self.details_cursor.row_factory = ExtraWorkDetails.row_factory
 
     def create_extra_work(self, type: str, start_time: Optional[str], end_time: Optional[str], assignee: Optional[int], extra_work_type_id: int, status: str, client_id: int):
         """Создает новую запись о дополнительной работе."""
@@ -31,16 +57,136 @@ class ExtraWorkDAO:
             VALUES (?, ?, ?, ?, ?, ?, ?)
         ''', (type, start_time, end_time, assignee, extra_work_type_id, status, client_id))
         self.connection.commit()
+        notify(self.db_name, 'extra_work')
+
+    def create_extra_works_many(self, works: Iterable[Tuple]) -> List[int]:
+        """Пакетно создает записи из кортежей (type, start_time, end_time, assignee, extra_work_type_id, status, client_id).
+
+        Возвращает ID созданных записей в порядке входных данных.
+        """
+        try:
+            return insert_many(self.connection, '''
+                INSERT INTO extra_work (type, start_time, end_time, assignee, extra_work_type_id, status, client_id)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', works)
+        finally:
+            # Часть пачек могла быть записана и до ошибки
+            notify(self.db_name, 'extra_work')
 
-    def get_extra_work(self, work_id: int) -> Optional[Tuple]:
-        """Возвращает запись о дополнительной работе по ID."""
-        self.cursor.execute('SELECT * FROM extra_work WHERE id = ?', (work_id,))
-        return self.cursor.fetchone()
+    def get_extra_work(self, work_id: int, include_archive: bool = False) -> Optional[ExtraWork]:
+        """Возвращает запись о дополнительной работе по ID; с include_archive ищет и в архиве."""
+        self.work_cursor.execute(f'SELECT {EXTRA_WORK_COLUMNS} FROM {extra_work_source(include_archive)} e WHERE e.id = ?', (work_id,))
+        return self.work_cursor.fetchone()
 
-    def get_all_extra_works(self) -> List[Tuple]:
+    def get_all_extra_works(self) -> List[ExtraWork]:
         """Возвращает все записи о дополнительной работе."""
-        self.cursor.execute('SELECT * FROM extra_work')
-        return self.cursor.fetchall()
+        self.work_cursor.execute(f'SELECT {EXTRA_WORK_COLUMNS} FROM extra_work e')
+        return self.work_cursor.fetchall()
+
+    def find_extra_works(self, assignee: Optional[int] = None, status: Optional[str] = None,
+                         client_id: Optional[int] = None, start_from: Optional[str] = None,
+                         start_to: Optional[str] = None, include_archive: bool = False) -> List[ExtraWork]:
+        """Возвращает записи, отфильтрованные по исполнителю, статусу, клиенту и интервалу времени начала.
+
+        С include_archive в выборку попадают и заявки, перенесенные в архив.
+        """
+        conditions = []
+        values = []
+
+        if assignee is not None:
+            conditions.append("e.assignee = ?")
+            values.append(assignee)
+        if status is not None:
+            conditions.append("e.status = ?")
+            values.append(status)
+        if client_id is not None:
+            conditions.append("e.client_id = ?")
+            values.append(client_id)
+        if start_from is not None:
+            conditions.append("e.start_time >= ?")
+            values.append(start_from)
+        if start_to is not None:
+            conditions.append("e.start_time < ?")
+            values.append(start_to)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        self.work_cursor.execute(
+            f'SELECT {EXTRA_WORK_COLUMNS} FROM {extra_work_source(include_archive)} e {where} ORDER BY e.id', values
+        )
+        return self.work_cursor.fetchall()
+
+    def get_extra_works_by_status(self, status: str) -> List[ExtraWork]:
+        """Возвращает записи с указанным статусом, например очередь заявок в статусе pending."""
+        self.work_cursor.execute(f'SELECT {EXTRA_WORK_COLUMNS} FROM extra_work e WHERE e.status = ? ORDER BY e.id', (status,))
+        return self.work_cursor.fetchall()
+
+    def get_extra_work_details(self, work_id: int, include_archive: bool = False) -> Optional[ExtraWorkDetails]:
+        """Возвращает заявку по ID вместе с типом работы, исполнителем и его должностью."""
+        self.details_cursor.execute(f'''
+            SELECT {EXTRA_WORK_DETAILS_COLUMNS}
+            FROM {extra_work_source(include_archive)} e
+            {EXTRA_WORK_DETAILS_JOINS}
+            WHERE e.id = ?
+        ''', (work_id,))
+        return self.details_cursor.fetchone()
+
+    def get_all_extra_work_details(self) -> List[ExtraWorkDetails]:
+        """Возвращает все заявки вместе с типом работы, исполнителем и его должностью одним запросом."""
+        self.details_cursor.execute(f'''
+            SELECT {EXTRA_WORK_DETAILS_COLUMNS}
+            FROM extra_work e
+            {EXTRA_WORK_DETAILS_JOINS}
+        ''')
+        return self.details_cursor.fetchall()
+
+    def get_extra_work_details_page(self, after_id: int, limit: int) -> List[ExtraWorkDetails]:
+        """Возвращает до limit заявок с деталями и ID больше after_id (keyset-пагинация по ID)."""
+        self.details_cursor.execute(f'''
+            SELECT {EXTRA_WORK_DETAILS_COLUMNS}
+            FROM extra_work e
+            {EXTRA_WORK_DETAILS_JOINS}
+            WHERE e.id > ?
+            ORDER BY e.id
+            LIMIT ?
+        ''', (after_id, limit))
+        return self.details_cursor.fetchall()
+
+    def get_extra_work_change_cursor(self) -> int:
+        """Возвращает курсор последнего изменения в таблице extra_work."""
+        self.cursor.execute('SELECT COALESCE(MAX(seq), 0) FROM extra_work_changes')
+        return self.cursor.fetchone()[0]
+
+    def get_extra_works_changed_since(self, cursor: int) -> Tuple[int, List[ExtraWork], List[int]]:
+        """Возвращает новый курсор, измененные после курсора записи и ID удаленных записей."""
+        return self._get_changed_since(cursor, ExtraWork, EXTRA_WORK_COLUMNS)
+
+    def get_extra_work_details_changed_since(self, cursor: int) -> Tuple[int, List[ExtraWorkDetails], List[int]]:
+        """Возвращает новый курсор, измененные после курсора заявки с деталями и ID удаленных заявок."""
+        return self._get_changed_since(cursor, ExtraWorkDetails, EXTRA_WORK_DETAILS_COLUMNS, EXTRA_WORK_DETAILS_JOINS)
+
+    def _get_changed_since(self, cursor: int, entity_class, columns: str, joins: str = '') -> Tuple[int, List, List[int]]:
+        new_cursor = self.get_extra_work_change_cursor()
+        if new_cursor <= cursor:
+            return cursor, [], []
+
+        changes_cursor = self.connection.cursor()
+        changes_cursor.row_factory = _changes_row_factory(entity_class)
+        changes_cursor.execute(f'''
+            SELECT c.work_id, {columns}
+            FROM extra_work_changes c
+            LEFT JOIN extra_work e ON e.id = c.work_id
+            {joins}
+            WHERE c.seq > ? AND c.seq <= ?
+        ''', (cursor, new_cursor))
+
+        changed = []
+        deleted = []
+        for work_id, work in changes_cursor.fetchall():
+            if work is None:
+                deleted.append(work_id)
+            else:
+                changed.append(work)
+        return new_cursor, changed, deleted
 
     def update_extra_work(self, work_id: int, **kwargs):
         """Обновляет запись о дополнительной работе по ID."""
@@ -78,16 +224,81 @@ class ExtraWorkDAO:
                 WHERE id = ?
             ''', values)
             self.connection.commit()
+            notify(self.db_name, 'extra_work')
+
+    def update_extra_works_status_many(self, updates: Iterable[Tuple[int, str]]) -> int:
+        """Пакетно меняет статус записей по парам (work_id, status). Возвращает число измененных записей."""
+        try:
+            return execute_many(
+                self.connection,
+                'UPDATE extra_work SET status = ? WHERE id = ?',
+                ((status, work_id) for work_id, status in updates)
+            )
+        finally:
+            # Часть пачек могла быть записана и до ошибки
+            notify(self.db_name, 'extra_work')
 
     def delete_extra_work(self, work_id: int):
         """Удаляет запись о дополнительной работе по ID."""
         self.cursor.execute('DELETE FROM extra_work WHERE id = ?', (work_id,))
         self.connection.commit()
+        notify(self.db_name, 'extra_work')
+
+    def delete_extra_works_many(self, work_ids: Iterable[int]) -> int:
+        """Пакетно удаляет записи по ID. Возвращает число удаленных записей."""
+        try:
+            return execute_many(
+                self.connection,
+                'DELETE FROM extra_work WHERE id = ?',
+                ((work_id,) for work_id in work_ids)
+            )
+        finally:
+            # Часть пачек могла быть записана и до ошибки
+            notify(self.db_name, 'extra_work')
+
+    def archive_paid_extra_works(self, ended_before: str, batch_size: int = ARCHIVE_BATCH_SIZE) -> int:
+        """Переносит оплаченные заявки, завершенные раньше ended_before, в архив.
+
+        Каждая пачка из batch_size заявок переносится в своей транзакции, чтобы
+        не держать блокировку записи долго. Возвращает число перенесенных заявок.
+        """
+        # Оба запроса выбирают одну и ту же пачку: между ними внутри транзакции extra_work не меняется
+        batch = '''
+            SELECT id FROM extra_work
+            WHERE status = 'paid' AND end_time < ?
+            ORDER BY end_time
+            LIMIT ?
+        '''
+        archived = 0
+        try:
+            while True:
+                archived_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+                self.cursor.execute('BEGIN IMMEDIATE')
+                try:
+                    self.cursor.execute(f'''
+                        INSERT INTO extra_work_archive
+                            (id, type, start_time, end_time, assignee, extra_work_type_id, status, client_id, archived_at)
+                        SELECT id, type, start_time, end_time, assignee, extra_work_type_id, status, client_id, ?
+                        FROM extra_work
+                        WHERE id IN ({batch})
+                    ''', (archived_at, ended_before, batch_size))
+                    self.cursor.execute(f'DELETE FROM extra_work WHERE id IN ({batch})', (ended_before, batch_size))
+                    moved = self.cursor.rowcount
+                    self.connection.commit()
+                except Exception:
+                    self.connection.rollback()
+                    raise
+                archived += moved
+                if moved < batch_size:
+                    return archived
+        finally:
+            if archived:
+                notify(self.db_name, 'extra_work')
 
     def get_last_inserted_id(self) -> int:
         """Возвращает ID последней вставленной записи."""
         return self.cursor.execute('SELECT last_insert_rowid()').fetchone()[0]
 
     def close(self):
-        """Закрывает соединение с базой данных."""
-        self.connection.close()
\ No newline at end of file
+        """Освобождает общее соединение с базой данных."""
+        release_connection(self.db_name)
\ No newline at end of file
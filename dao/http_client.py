@@ -0,0 +1,70 @@
+import http.client
+import json
+import os
+from typing import Dict
+from urllib.parse import urlsplit
+
+from dao import connection
+from dao.rpc import DAOS, decode, decode_error, encode
+
+# Сколько секунд ждать ответа сервера
+API_TIMEOUT = float(os.environ.get('MIS_API_TIMEOUT', 30))
+
+
+class HttpDAO:
+    """Клиентский DAO: каждый вызов метода - запрос POST /<dao>/<метод> к серверу.
+
+    Держит одно постоянное HTTP-соединение, поэтому, как и обычный DAO,
+    используется только в создавшем его потоке.
+    """
+
+    name = None
+
+    def __init__(self, db_name=None, api_url: str = None):
+        # db_name оставлен для совместимости с обычными DAO: базу данных выбирает сервер
+        url = urlsplit(api_url or connection.API_URL)
+        self.connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=API_TIMEOUT)
+
+    def call(self, method_name: str, *args, **kwargs):
+        body = json.dumps({'args': encode(args), 'kwargs': encode(kwargs)})
+        try:
+            self.connection.request('POST', f'/{self.name}/{method_name}', body,
+                                    {'Content-Type': 'application/json'})
+            response = self.connection.getresponse()
+            payload = json.loads(response.read())
+        except (OSError, http.client.HTTPException):
+            # После обрыва соединение будет открыто заново при следующем запросе
+            self.connection.close()
+            raise
+        if 'error' in payload:
+            raise decode_error(payload['error'])
+        return decode(payload['result'])
+
+    def close(self):
+        """Закрывает HTTP-соединение с сервером."""
+        self.connection.close()
+
+
+def _remote_method(method_name: str):
+    def call(self, *args, **kwargs):
+        return self.call(method_name, *args, **kwargs)
+    call.__name__ = method_name
+    return call
+
+
+def _remote_class(name: str, async_dao) -> type:
+    methods = {method_name: _remote_method(method_name) for method_name in async_dao.operations()}
+    return type(f'Http{async_dao.dao_class.__name__}', (HttpDAO,), {'name': name, **methods})
+
+
+REMOTE_DAOS: Dict[type, type] = {
+    async_dao.dao_class: _remote_class(name, async_dao) for name, async_dao in DAOS.items()
+}
+
+
+def remote_dao_class(dao_class) -> type:
+    """Возвращает клиентский класс для DAO dao_class."""
+    remote_class = REMOTE_DAOS.get(dao_class)
+    if remote_class is None:
+        raise ValueError(f'{dao_class.__name__} недоступен через сервер')
+    return remote_class
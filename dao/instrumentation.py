@@ -0,0 +1,288 @@
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from itertools import chain
+from typing import Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+# Инструментирование включается переменной окружения или вызовом enable()
+ENABLED = os.environ.get('MIS_DB_INSTRUMENT', '') not in ('', '0')
+# Запросы дольше порога (в миллисекундах) пишутся в журнал вместе с EXPLAIN QUERY PLAN
+SLOW_QUERY_MS = float(os.environ.get('MIS_DB_SLOW_QUERY_MS', 100))
+# Сколько последних замеров каждого запроса хранить для перцентилей
+SAMPLE_SIZE = 1024
+# Файл, в который статистика периодически выгружается, и период выгрузки в секундах
+DUMP_PATH = os.environ.get('MIS_DB_STATS_FILE') or None
+DUMP_INTERVAL = float(os.environ.get('MIS_DB_STATS_INTERVAL', 60))
+
+_EXPLAINABLE = ('SELECT', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'WITH')
+_WHITESPACE = re.compile(r'\s+')
+
+_lock = threading.Lock()
+_stats: Dict[str, 'QueryStats'] = {}
+_dump_thread: Optional[threading.Thread] = None
+_dump_stop = threading.Event()
+_dump_lock = threading.Lock()
+
+
+class QueryStats:
+    """Накопленная статистика одного SQL-запроса."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.rows = 0
+        self.slow = 0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+    def to_dict(self) -> dict:
+        samples = sorted(self.samples)
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total * 1000 / self.count if self.count else 0.0,
+            'p50_ms': _percentile(samples, 0.50) * 1000,
+            'p95_ms': _percentile(samples, 0.95) * 1000,
+            'p99_ms': _percentile(samples, 0.99) * 1000,
+            'rows': self.rows,
+            'slow': self.slow,
+        }
+
+
+def _percentile(samples, fraction: float) -> float:
+    if not samples:
+        return 0.0
+    return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+def normalize(sql: str) -> str:
+    """Приводит текст запроса к одной строке, чтобы одинаковые запросы попадали в одну запись."""
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def record(sql: str, elapsed: float, rows: int = 0):
+    """Добавляет замер запроса в статистику."""
+    with _lock:
+        stats = _stats.get(sql)
+        if stats is None:
+            stats = _stats[sql] = QueryStats()
+        stats.count += 1
+        stats.total += elapsed
+        stats.rows += rows
+        stats.samples.append(elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_MS:
+            stats.slow += 1
+
+
+class InstrumentedCursor(sqlite3.Cursor):
+    """Курсор, замеряющий время запросов вместе с чтением результата и число прочитанных строк.
+
+    SQLite вычисляет результат по мере чтения строк, поэтому замер запроса
+    завершается, когда результат прочитан до конца, курсор выполняет
+    следующий запрос или закрывается.
+    """
+
+    _sql = None
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._start(sql, parameters, started)
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        started = time.perf_counter()
+        # Первая строка параметров сохраняется для EXPLAIN QUERY PLAN медленного запроса
+        rows = iter(seq_of_parameters)
+        first = next(rows, None)
+        if first is not None:
+            rows = chain((first,), rows)
+        try:
+            return super().executemany(sql, rows)
+        finally:
+            self._start(sql, first, started)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched(0 if row is None else 1, started, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(len(rows), started, len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(len(rows), started, True)
+        return rows
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched(0, started, True)
+            raise
+        self._fetched(1, started, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        # Результат, прочитанный не до конца (например, одним fetchone), учитывается при удалении курсора
+        self._finish()
+
+    def _start(self, sql, parameters, started: float):
+        self._sql = sql
+        self._parameters = parameters
+        self._elapsed = time.perf_counter() - started
+        self._rows = 0
+        if self.description is None:
+            # Запрос без результата уже выполнен полностью
+            self._rows = max(self.rowcount, 0)
+            self._finish()
+
+    def _fetched(self, rows: int, started: float, exhausted: bool):
+        if self._sql is None:
+            return
+        self._elapsed += time.perf_counter() - started
+        self._rows += rows
+        if exhausted:
+            self._finish()
+
+    def _finish(self):
+        if self._sql is None:
+            return
+        sql, self._sql = self._sql, None
+        record(normalize(sql), self._elapsed, self._rows)
+        if self._elapsed * 1000 >= SLOW_QUERY_MS:
+            _log_slow(self.connection, sql, self._parameters, self._elapsed)
+
+
+class InstrumentedConnection(sqlite3.Connection):
+    """Соединение, все курсоры которого инструментированы, включая курсоры execute и executemany."""
+
+    def cursor(self, factory=InstrumentedCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def _log_slow(connection: sqlite3.Connection, sql: str, parameters, elapsed: float):
+    plan = None
+    # parameters равен None только у executemany без строк параметров: объяснять нечего
+    if parameters is not None and sql.lstrip().upper().startswith(_EXPLAINABLE):
+        try:
+            # Обычный курсор, чтобы план не попал в статистику
+            rows = sqlite3.Connection.cursor(connection).execute(
+                f'EXPLAIN QUERY PLAN {sql}', parameters).fetchall()
+            plan = '\n'.join(f'    {row[-1]}' for row in rows)
+        except sqlite3.Error as error:
+            plan = f'    план недоступен: {error}'
+    logger.warning('Медленный запрос (%.1f мс): %s%s', elapsed * 1000, normalize(sql),
+                   f'\n{plan}' if plan else '')
+
+
+def enable(slow_query_ms: float = None, dump_path: str = None, dump_interval: float = None):
+    """Включает инструментирование соединений, открытых после вызова."""
+    global ENABLED, SLOW_QUERY_MS, DUMP_PATH, DUMP_INTERVAL
+    ENABLED = True
+    if slow_query_ms is not None:
+        SLOW_QUERY_MS = slow_query_ms
+    if dump_interval is not None:
+        DUMP_INTERVAL = dump_interval
+    if dump_path is not None:
+        DUMP_PATH = dump_path
+        start_dump(DUMP_PATH, DUMP_INTERVAL)
+
+
+def disable():
+    """Отключает инструментирование новых соединений и периодическую выгрузку."""
+    global ENABLED
+    ENABLED = False
+    stop_dump()
+
+
+def connection_factory():
+    """Возвращает класс соединения для sqlite3.connect с учетом настроек."""
+    if not ENABLED:
+        return sqlite3.Connection
+    if DUMP_PATH and _dump_thread is None:
+        start_dump(DUMP_PATH, DUMP_INTERVAL)
+    return InstrumentedConnection
+
+
+def snapshot() -> Dict[str, dict]:
+    """Возвращает статистику по запросам, отсортированную по суммарному времени."""
+    with _lock:
+        items = [(sql, stats.to_dict()) for sql, stats in _stats.items()]
+    items.sort(key=lambda item: item[1]['total_ms'], reverse=True)
+    return dict(items)
+
+
+def reset():
+    """Очищает накопленную статистику."""
+    with _lock:
+        _stats.clear()
+
+
+def dump(path: str):
+    """Записывает снимок статистики в JSON-файл."""
+    temporary = f'{path}.tmp'
+    with open(temporary, 'w', encoding='utf-8') as file:
+        json.dump({'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'queries': snapshot()},
+                  file, ensure_ascii=False, indent=2)
+    os.replace(temporary, path)
+
+
+def start_dump(path: str, interval: float = 60.0):
+    """Запускает фоновую выгрузку статистики в файл каждые interval секунд."""
+    global _dump_thread, _dump_stop
+    with _dump_lock:
+        _stop_dump()
+        stop = _dump_stop = threading.Event()
+
+        def run():
+            while not stop.wait(interval):
+                try:
+                    dump(path)
+                except OSError:
+                    logger.exception('Не удалось записать статистику запросов в %s', path)
+
+        _dump_thread = threading.Thread(target=run, name='query-stats-dump', daemon=True)
+        _dump_thread.start()
+
+
+def stop_dump():
+    """Останавливает фоновую выгрузку статистики."""
+    with _dump_lock:
+        _stop_dump()
+
+
+def _stop_dump():
+    global _dump_thread
+    if _dump_thread is not None:
+        _dump_stop.set()
+        _dump_thread.join()
+        _dump_thread = None
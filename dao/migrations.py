@@ -0,0 +1,503 @@
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Tuple
+
+
+def _create_base_tables(cursor: sqlite3.Cursor):
+    """Создает исходные таблицы и журнал изменений extra_work; в существующей базе ничего не меняет."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS client (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            first_name TEXT,
+            last_name TEXT,
+            phone_number TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS extra_work_type (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL,
+            payment REAL,
+            type TEXT
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS post (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS duties (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            description TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS post_duties (
+            post_id INTEGER,
+            duty_id INTEGER,
+            PRIMARY KEY (post_id, duty_id),
+            FOREIGN KEY (post_id) REFERENCES post(id),
+            FOREIGN KEY (duty_id) REFERENCES duties(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS worker (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            full_name TEXT NOT NULL,
+            sex TEXT,
+            phone_number TEXT,
+            passport_number TEXT,
+            passport_series TEXT,
+            post_id INTEGER,
+            balance REAL DEFAULT 0.0,
+            FOREIGN KEY (post_id) REFERENCES post(id)
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS extra_work (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            type TEXT,
+            start_time DATETIME,
+            end_time DATETIME,
+            assignee INTEGER REFERENCES worker(id),
+            extra_work_type_id INTEGER REFERENCES extra_work_type(id),
+            status TEXT,
+            client_id INTEGER REFERENCES client(id)
+        )
+    ''')
+    # Журнал изменений: по одной записи на заявку с номером последнего изменения
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS extra_work_changes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            work_id INTEGER NOT NULL UNIQUE
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS extra_work_changes_insert AFTER INSERT ON extra_work
+        BEGIN
+            INSERT OR REPLACE INTO extra_work_changes (work_id) VALUES (NEW.id);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS extra_work_changes_update AFTER UPDATE ON extra_work
+        BEGIN
+            INSERT OR REPLACE INTO extra_work_changes (work_id) VALUES (NEW.id);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS extra_work_changes_update_id AFTER UPDATE OF id ON extra_work
+        WHEN OLD.id != NEW.id
+        BEGIN
+            INSERT OR REPLACE INTO extra_work_changes (work_id) VALUES (OLD.id);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS extra_work_changes_delete AFTER DELETE ON extra_work
+        BEGIN
+            INSERT OR REPLACE INTO extra_work_changes (work_id) VALUES (OLD.id);
+        END
+    ''')
+
+
+def _create_lookup_indexes(cursor: sqlite3.Cursor):
+    """Создает индексы для фильтров по статусу, исполнителю, клиенту и поиска работника по имени."""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_status ON extra_work (status)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_assignee ON extra_work (assignee)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_client_id ON extra_work (client_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_worker_full_name ON worker (full_name)')
+
+
+def _create_filter_indexes(cursor: sqlite3.Cursor):
+    """Заменяет индекс по исполнителю составным (assignee, status) и индексирует время начала."""
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_assignee_status ON extra_work (assignee, status)')
+    cursor.execute('DROP INDEX IF EXISTS idx_extra_work_assignee')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_start_time ON extra_work (start_time)')
+
+
+def _create_catalog_version(cursor: sqlite3.Cursor):
+    """Создает счетчик версии справочника типов работ, который увеличивается триггерами при любом изменении."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS catalog_version (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO catalog_version (name, version) VALUES ('extra_work_type', 0)")
+    for event in ('INSERT', 'UPDATE', 'DELETE'):
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS extra_work_type_version_{event.lower()} AFTER {event} ON extra_work_type
+            BEGIN
+                UPDATE catalog_version SET version = version + 1 WHERE name = 'extra_work_type';
+            END
+        ''')
+
+
+def _create_worker_version(cursor: sqlite3.Cursor):
+    """Создает счетчик версии данных работников, должностей и обязанностей для кэша работников."""
+    cursor.execute("INSERT OR IGNORE INTO catalog_version (name, version) VALUES ('worker', 0)")
+    for table in ('worker', 'post', 'duties', 'post_duties'):
+        for event in ('INSERT', 'UPDATE', 'DELETE'):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_version_{event.lower()} AFTER {event} ON {table}
+                BEGIN
+                    UPDATE catalog_version SET version = version + 1 WHERE name = 'worker';
+                END
+            ''')
+
+
+def _payment(row: str) -> str:
+    return f'COALESCE((SELECT payment FROM extra_work_type WHERE id = {row}.extra_work_type_id), 0)'
+
+
+def _apply_summary(row: str, sign: int) -> str:
+    """Возвращает SQL, который прибавляет (sign=1) или вычитает (sign=-1) заявку row из сводных таблиц."""
+    payment = _payment(row)
+    return f'''
+        INSERT INTO extra_work_status_summary (status, count, amount)
+        SELECT {row}.status, {sign}, {sign} * {payment}
+        WHERE {row}.status IS NOT NULL
+        ON CONFLICT (status) DO UPDATE SET
+            count = count + excluded.count,
+            amount = amount + excluded.amount;
+        INSERT INTO worker_work_summary (worker_id, in_progress_count, done_count, paid_count, unpaid_amount, earned_amount)
+        SELECT {row}.assignee,
+               {sign} * ({row}.status = 'in progress'),
+               {sign} * ({row}.status = 'done'),
+               {sign} * ({row}.status = 'paid'),
+               {sign} * ({row}.status = 'done') * {payment},
+               {sign} * ({row}.status = 'paid') * {payment}
+        WHERE {row}.assignee IS NOT NULL AND {row}.status IN ('in progress', 'done', 'paid')
+        ON CONFLICT (worker_id) DO UPDATE SET
+            in_progress_count = in_progress_count + excluded.in_progress_count,
+            done_count = done_count + excluded.done_count,
+            paid_count = paid_count + excluded.paid_count,
+            unpaid_amount = unpaid_amount + excluded.unpaid_amount,
+            earned_amount = earned_amount + excluded.earned_amount;
+    '''
+
+
+def _reprice_summary(type_id: str, delta: str, source: str = 'extra_work') -> str:
+    """Возвращает SQL, который пересчитывает суммы в сводных таблицах при изменении оплаты типа работы."""
+    return f'''
+        UPDATE extra_work_status_summary SET amount = amount + {delta} * s.count
+        FROM (SELECT status, COUNT(*) AS count FROM {source}
+              WHERE extra_work_type_id = {type_id} GROUP BY status) AS s
+        WHERE extra_work_status_summary.status = s.status;
+        UPDATE worker_work_summary SET
+            unpaid_amount = unpaid_amount + {delta} * s.done_count,
+            earned_amount = earned_amount + {delta} * s.paid_count
+        FROM (SELECT assignee, SUM(status = 'done') AS done_count, SUM(status = 'paid') AS paid_count
+              FROM {source} WHERE extra_work_type_id = {type_id} AND assignee IS NOT NULL
+              GROUP BY assignee) AS s
+        WHERE worker_work_summary.worker_id = s.assignee;
+    '''
+
+
+def _create_dashboard_summaries(cursor: sqlite3.Cursor):
+    """Создает сводные таблицы для панели менеджера, заполняет их и поддерживает триггерами.
+
+    Суммы считаются по текущей оплате типа работы, поэтому сводка всегда совпадает
+    с агрегирующим запросом по extra_work и extra_work_type.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS extra_work_status_summary (
+            status TEXT PRIMARY KEY NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            amount REAL NOT NULL DEFAULT 0
+        )
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS worker_work_summary (
+            worker_id INTEGER PRIMARY KEY REFERENCES worker(id),
+            in_progress_count INTEGER NOT NULL DEFAULT 0,
+            done_count INTEGER NOT NULL DEFAULT 0,
+            paid_count INTEGER NOT NULL DEFAULT 0,
+            unpaid_amount REAL NOT NULL DEFAULT 0,
+            earned_amount REAL NOT NULL DEFAULT 0
+        )
+    ''')
+    # Индекс нужен триггерам пересчета сумм при изменении оплаты типа работы
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_type_status ON extra_work (extra_work_type_id, status)')
+
+    cursor.execute('DELETE FROM extra_work_status_summary')
+    cursor.execute('DELETE FROM worker_work_summary')
+    cursor.execute('''
+        INSERT INTO extra_work_status_summary (status, count, amount)
+        SELECT e.status, COUNT(*), TOTAL(t.payment)
+        FROM extra_work e
+        LEFT JOIN extra_work_type t ON t.id = e.extra_work_type_id
+        WHERE e.status IS NOT NULL
+        GROUP BY e.status
+    ''')
+    cursor.execute('''
+        INSERT INTO worker_work_summary (worker_id, in_progress_count, done_count, paid_count, unpaid_amount, earned_amount)
+        SELECT e.assignee,
+               SUM(e.status = 'in progress'),
+               SUM(e.status = 'done'),
+               SUM(e.status = 'paid'),
+               TOTAL(CASE WHEN e.status = 'done' THEN t.payment END),
+               TOTAL(CASE WHEN e.status = 'paid' THEN t.payment END)
+        FROM extra_work e
+        LEFT JOIN extra_work_type t ON t.id = e.extra_work_type_id
+        WHERE e.assignee IS NOT NULL AND e.status IN ('in progress', 'done', 'paid')
+        GROUP BY e.assignee
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS extra_work_summary_insert AFTER INSERT ON extra_work
+        BEGIN
+            {_apply_summary('NEW', 1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS extra_work_summary_delete AFTER DELETE ON extra_work
+        BEGIN
+            {_apply_summary('OLD', -1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS extra_work_summary_update
+        AFTER UPDATE OF status, assignee, extra_work_type_id ON extra_work
+        WHEN OLD.status IS NOT NEW.status OR OLD.assignee IS NOT NEW.assignee
+            OR OLD.extra_work_type_id IS NOT NEW.extra_work_type_id
+        BEGIN
+            {_apply_summary('OLD', -1)}
+            {_apply_summary('NEW', 1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS extra_work_type_summary_update AFTER UPDATE OF payment ON extra_work_type
+        WHEN OLD.payment IS NOT NEW.payment
+        BEGIN
+            {_reprice_summary('NEW.id', '(COALESCE(NEW.payment, 0) - COALESCE(OLD.payment, 0))')}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS extra_work_type_summary_delete AFTER DELETE ON extra_work_type
+        BEGIN
+            {_reprice_summary('OLD.id', '-COALESCE(OLD.payment, 0)')}
+        END
+    ''')
+
+
+def _create_post_work_types(cursor: sqlite3.Cursor):
+    """Создает таблицу типов работ, которые могут выполнять работники на должности."""
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS post_work_type (
+            post_id INTEGER NOT NULL REFERENCES post(id),
+            extra_work_type_id INTEGER NOT NULL REFERENCES extra_work_type(id),
+            PRIMARY KEY (post_id, extra_work_type_id)
+        )
+    ''')
+
+
+def _create_extra_work_archive(cursor: sqlite3.Cursor):
+    """Создает архив оплаченных заявок и представление extra_work_history со всеми заявками.
+
+    Строки архива входят в сводные таблицы: перенос заявки вычитает ее триггером
+    удаления из extra_work и снова добавляет триггером вставки в архив.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS extra_work_archive (
+            id INTEGER PRIMARY KEY,
+            type TEXT,
+            start_time DATETIME,
+            end_time DATETIME,
+            assignee INTEGER REFERENCES worker(id),
+            extra_work_type_id INTEGER REFERENCES extra_work_type(id),
+            status TEXT,
+            client_id INTEGER REFERENCES client(id),
+            archived_at DATETIME NOT NULL
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_archive_assignee ON extra_work_archive (assignee)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_archive_client_id ON extra_work_archive (client_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_archive_type_status ON extra_work_archive (extra_work_type_id, status)')
+    # Выбор оплаченных заявок для архивации идет по индексу (status, end_time), он же заменяет индекс по статусу
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_status_end_time ON extra_work (status, end_time)')
+    cursor.execute('DROP INDEX IF EXISTS idx_extra_work_status')
+    cursor.execute('''
+        CREATE VIEW IF NOT EXISTS extra_work_history AS
+        SELECT id, type, start_time, end_time, assignee, extra_work_type_id, status, client_id FROM extra_work
+        UNION ALL
+        SELECT id, type, start_time, end_time, assignee, extra_work_type_id, status, client_id FROM extra_work_archive
+    ''')
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS extra_work_archive_summary_insert AFTER INSERT ON extra_work_archive
+        BEGIN
+            {_apply_summary('NEW', 1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS extra_work_archive_summary_delete AFTER DELETE ON extra_work_archive
+        BEGIN
+            {_apply_summary('OLD', -1)}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS extra_work_archive_summary_update
+        AFTER UPDATE OF status, assignee, extra_work_type_id ON extra_work_archive
+        WHEN OLD.status IS NOT NEW.status OR OLD.assignee IS NOT NEW.assignee
+            OR OLD.extra_work_type_id IS NOT NEW.extra_work_type_id
+        BEGIN
+            {_apply_summary('OLD', -1)}
+            {_apply_summary('NEW', 1)}
+        END
+    ''')
+    # Пересчет сумм при изменении оплаты типа работы теперь учитывает и архив
+    cursor.execute('DROP TRIGGER IF EXISTS extra_work_type_summary_update')
+    cursor.execute('DROP TRIGGER IF EXISTS extra_work_type_summary_delete')
+    cursor.execute(f'''
+        CREATE TRIGGER extra_work_type_summary_update AFTER UPDATE OF payment ON extra_work_type
+        WHEN OLD.payment IS NOT NEW.payment
+        BEGIN
+            {_reprice_summary('NEW.id', '(COALESCE(NEW.payment, 0) - COALESCE(OLD.payment, 0))', 'extra_work_history')}
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER extra_work_type_summary_delete AFTER DELETE ON extra_work_type
+        BEGIN
+            {_reprice_summary('OLD.id', '-COALESCE(OLD.payment, 0)', 'extra_work_history')}
+        END
+    ''')
+
+
+def _create_search_index(cursor: sqlite3.Cursor, table: str, columns: Tuple[str, ...]):
+    """Создает FTS5-индекс над столбцами таблицы, синхронизируемый триггерами, и заполняет его."""
+    fts = f'{table}_fts'
+    column_list = ', '.join(columns)
+    new_values = ', '.join(f'NEW.{column}' for column in columns)
+    old_values = ', '.join(f'OLD.{column}' for column in columns)
+    cursor.execute(f'''
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {column_list}, content='{table}', content_rowid='id', tokenize='unicode61 remove_diacritics 2'
+        )
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table}
+        BEGIN
+            INSERT INTO {fts} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', OLD.id, {old_values});
+        END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF id, {column_list} ON {table}
+        BEGIN
+            INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', OLD.id, {old_values});
+            INSERT INTO {fts} (rowid, {column_list}) VALUES (NEW.id, {new_values});
+        END
+    ''')
+    cursor.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+def _create_search_indexes(cursor: sqlite3.Cursor):
+    """Создает полнотекстовые индексы типов работ, работников и клиентов."""
+    _create_search_index(cursor, 'extra_work_type', ('type', 'description'))
+    _create_search_index(cursor, 'worker', ('full_name',))
+    _create_search_index(cursor, 'client', ('first_name', 'last_name', 'phone_number'))
+
+
+def _create_analytics_indexes(cursor: sqlite3.Cursor):
+    """Создает индекс архива по времени завершения для выборок статистики за период."""
+    # В архиве только оплаченные заявки, поэтому статус в индексе не нужен
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_extra_work_archive_end_time ON extra_work_archive (end_time)')
+
+
+def _create_details_change_triggers(cursor: sqlite3.Cursor):
+    """Создает триггеры, которые отмечают в журнале изменений заявки, чьи детали изменились в других таблицах.
+
+    Название типа, оплата, имя исполнителя и должность читаются в деталях заявки соединением,
+    поэтому без этих триггеров лента изменений не вернула бы такие заявки повторно.
+    """
+    # Таблица -> (столбцы, попадающие в детали заявки; запрос ID затронутых заявок)
+    sources = {
+        'extra_work_type': ('type, payment', 'SELECT id FROM extra_work WHERE extra_work_type_id = {row}.id'),
+        'worker': ('full_name, post_id', 'SELECT id FROM extra_work WHERE assignee = {row}.id'),
+        'post': ('title', 'SELECT e.id FROM extra_work e JOIN worker w ON w.id = e.assignee WHERE w.post_id = {row}.id'),
+    }
+    for table, (columns, works) in sources.items():
+        for name, event, row in (('update', f'UPDATE OF {columns}', 'NEW'), ('delete', 'DELETE', 'OLD')):
+            cursor.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {table}_details_{name} AFTER {event} ON {table}
+                BEGIN
+                    INSERT OR REPLACE INTO extra_work_changes (work_id) {works.format(row=row)};
+                END
+            ''')
+
+
+# Миграции применяются по возрастанию версии; уже выпущенные миграции не меняются, новые добавляются в конец
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Cursor], None]]] = [
+    (1, 'base tables', _create_base_tables),
+    (2, 'lookup indexes', _create_lookup_indexes),
+    (3, 'filter indexes', _create_filter_indexes),
+    (4, 'catalog version', _create_catalog_version),
+    (5, 'worker version', _create_worker_version),
+    (6, 'dashboard summaries', _create_dashboard_summaries),
+    (7, 'post work types', _create_post_work_types),
+    (8, 'extra work archive', _create_extra_work_archive),
+    (9, 'search indexes', _create_search_indexes),
+    (10, 'analytics indexes', _create_analytics_indexes),
+    (11, 'details change triggers', _create_details_change_triggers),
+]
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version(connection: sqlite3.Connection) -> int:
+    """Возвращает номер последней примененной миграции."""
+    connection.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            version INTEGER PRIMARY KEY,
+            description TEXT NOT NULL,
+            applied_at DATETIME NOT NULL
+        )
+    ''')
+    return connection.execute('SELECT COALESCE(MAX(version), 0) FROM schema_migrations').fetchone()[0]
+
+
+def migrate(connection: sqlite3.Connection) -> int:
+    """Применяет недостающие миграции, каждую в своей транзакции. Возвращает итоговую версию схемы.
+
+    Номер версии дублируется в PRAGMA user_version: он хранится в заголовке файла базы,
+    поэтому актуальная схема проверяется одним чтением без обращения к таблицам.
+    """
+    user_version = connection.execute('PRAGMA user_version').fetchone()[0]
+    if user_version >= LATEST_VERSION:
+        return user_version
+
+    version = get_schema_version(connection)
+    connection.commit()
+    for migration_version, description, apply in MIGRATIONS:
+        if migration_version <= version:
+            continue
+
+        cursor = connection.cursor()
+        # IMMEDIATE сразу берет блокировку записи, чтобы параллельные процессы не применили миграцию дважды
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            # Другой процесс мог применить миграцию, пока мы ждали блокировку
+            if get_schema_version(connection) < migration_version:
+                apply(cursor)
+                cursor.execute(
+                    'INSERT INTO schema_migrations (version, description, applied_at) VALUES (?, ?, ?)',
+                    (migration_version, description, datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+                )
+                cursor.execute(f'PRAGMA user_version = {int(migration_version)}')
+            connection.commit()
+        except Exception:
+            connection.rollback()
+            raise
+        version = migration_version
+
+    if user_version != version:
+        # База, обновленная до появления user_version или другим процессом
+        connection.execute(f'PRAGMA user_version = {int(version)}')
+        connection.commit()
+    return version
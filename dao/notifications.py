@@ -0,0 +1,77 @@
+import json
+import os
+import socket
+import threading
+import time
+from typing import Optional, Tuple
+
+
+# Адрес концентратора уведомлений (notification_hub.py); пустая строка отключает уведомления
+HUB_ADDRESS = os.environ.get('MIS_NOTIFY_ADDRESS', '127.0.0.1:8766')
+# Через сколько секунд снова пытаться подключиться к концентратору после ошибки
+RETRY_INTERVAL = 5.0
+# Ключ подписки на изменения всех баз данных
+ALL_DATABASES = '*'
+
+
+def hub_address() -> Optional[Tuple[str, int]]:
+    """Возвращает (host, port) концентратора или None, если уведомления отключены."""
+    if not HUB_ADDRESS:
+        return None
+    host, _, port = HUB_ADDRESS.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def notification_key(db_name: str) -> Optional[str]:
+    """Возвращает ключ базы данных в уведомлениях или None для базы в памяти."""
+    if db_name == ':memory:':
+        return None
+    return os.path.abspath(db_name)
+
+
+def encode_message(message: dict) -> bytes:
+    return json.dumps(message, ensure_ascii=False).encode('utf-8') + b'\n'
+
+
+class _Publisher:
+    """Отправляет уведомления концентратору через одно соединение на процесс.
+
+    Если концентратор не запущен, уведомление теряется, а следующая попытка
+    подключения будет не раньше чем через RETRY_INTERVAL: запись в базу данных
+    не должна замедляться из-за уведомлений.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.socket: Optional[socket.socket] = None
+        self.retry_at = 0.0
+
+    def send(self, data: bytes):
+        address = hub_address()
+        if address is None:
+            return
+        with self.lock:
+            if self.socket is None:
+                if time.monotonic() < self.retry_at:
+                    return
+                try:
+                    self.socket = socket.create_connection(address, timeout=0.5)
+                except OSError:
+                    self.retry_at = time.monotonic() + RETRY_INTERVAL
+                    return
+            try:
+                self.socket.sendall(data)
+            except OSError:
+                self.socket.close()
+                self.socket = None
+                self.retry_at = time.monotonic() + RETRY_INTERVAL
+
+
+_publisher = _Publisher()
+
+
+def notify(db_name: str, *tables: str):
+    """Сообщает подписчикам, что в базе данных db_name изменились таблицы tables."""
+    key = notification_key(db_name)
+    if key is not None:
+        _publisher.send(encode_message({'publish': key, 'tables': list(tables)}))
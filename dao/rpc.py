@@ -0,0 +1,78 @@
+import builtins
+import sqlite3
+from dataclasses import fields, is_dataclass
+from typing import Any, Dict
+
+from dao.aio import (AsyncAnalyticsDAO, AsyncClientDAO, AsyncDashboardDAO, AsyncDispatchDAO, AsyncExtraWorkDAO,
+                     AsyncExtraWorkTypeDAO, AsyncWorkerDAO)
+from entity.analytics import CompletionTimes, DailyThroughput
+from entity.client import Client
+from entity.dashboard import StatusSummary, WorkerTotals
+from entity.extra_work import ExtraWork, ExtraWorkDetails
+from entity.extra_work_type import ExtraWorkType
+from entity.post import Post
+from entity.worker import Worker
+
+
+# DAO, доступные по HTTP: имя в пути запроса -> асинхронная обертка с реестром операций чтения и записи
+DAOS = {
+    'extra_work': AsyncExtraWorkDAO,
+    'worker': AsyncWorkerDAO,
+    'client': AsyncClientDAO,
+    'extra_work_type': AsyncExtraWorkTypeDAO,
+    'dashboard': AsyncDashboardDAO,
+    'dispatch': AsyncDispatchDAO,
+    'analytics': AsyncAnalyticsDAO,
+}
+
+ENTITIES = {entity.__name__: entity for entity in (
+    ExtraWork, ExtraWorkDetails, ExtraWorkType, Client, Post, Worker, StatusSummary, WorkerTotals,
+    CompletionTimes, DailyThroughput,
+)}
+
+
+class RemoteError(Exception):
+    """Ошибка на сервере, для которой нет подходящего класса исключения на клиенте."""
+
+    def __init__(self, error_type: str, message: str):
+        super().__init__(f'{error_type}: {message}')
+        self.error_type = error_type
+
+
+def encode(value: Any) -> Any:
+    """Преобразует результат DAO в значение, которое можно записать в JSON без потери типов."""
+    if is_dataclass(value):
+        return {'__entity__': type(value).__name__,
+                'fields': {field.name: encode(getattr(value, field.name)) for field in fields(value)}}
+    if isinstance(value, dict):
+        # У JSON ключи только строковые, поэтому словари передаются списком пар
+        return {'__dict__': [[encode(key), encode(item)] for key, item in value.items()]}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return [encode(item) for item in value]
+    return value
+
+
+def decode(value: Any) -> Any:
+    """Восстанавливает значение, закодированное encode."""
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    if isinstance(value, dict):
+        if '__entity__' in value:
+            entity = ENTITIES[value['__entity__']]
+            return entity(**{name: decode(item) for name, item in value['fields'].items()})
+        if '__dict__' in value:
+            return {decode(key): decode(item) for key, item in value['__dict__']}
+        return {key: decode(item) for key, item in value.items()}
+    return value
+
+
+def encode_error(error: Exception) -> Dict[str, str]:
+    return {'type': type(error).__name__, 'message': str(error)}
+
+
+def decode_error(error: Dict[str, str]) -> Exception:
+    """Возвращает исключение того же класса, что на сервере, если это ошибка sqlite3 или встроенная."""
+    error_class = getattr(sqlite3, error['type'], None) or getattr(builtins, error['type'], None)
+    if isinstance(error_class, type) and issubclass(error_class, Exception):
+        return error_class(error['message'])
+    return RemoteError(error['type'], error['message'])
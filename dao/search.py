@@ -0,0 +1,20 @@
+import re
+from typing import Optional
+
+
+# Слова запроса: буквы, цифры и подчеркивание; остальные символы разделяют слова
+_WORD = re.compile(r'\w+')
+# Сколько результатов поиска возвращается по умолчанию
+SEARCH_LIMIT = 50
+
+
+def prefix_query(text: str) -> Optional[str]:
+    """Преобразует строку поиска в запрос FTS5: каждое слово ищется по префиксу, все слова обязательны.
+
+    Возвращает None, если в строке нет ни одного слова.
+    """
+    words = _WORD.findall(text)
+    if not words:
+        return None
+    # Кавычки исключают разбор слов как операторов FTS5 (AND, NOT, NEAR)
+    return ' '.join(f'"{word}"*' for word in words)
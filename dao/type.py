@@ -1,23 +1,30 @@
 import sqlite3
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from dao.bulk import insert_many
+from dao.cache import get_versioned_cache
+from dao.connection import database_key, get_connection, release_connection
+from dao.notifications import notify
+from dao.search import SEARCH_LIMIT, prefix_query
+from entity.extra_work_type import ExtraWorkType
+
+
+def _load_catalog(cursor: sqlite3.Cursor) -> Tuple[List[ExtraWorkType], Dict[int, ExtraWorkType]]:
+    cursor = cursor.connection.cursor()
+    cursor.row_factory = ExtraWorkType.row_factory
+    cursor.execute('SELECT id, description, payment, type FROM extra_work_type')
+    work_types = cursor.fetchall()
+    return work_types, {work_type.id: work_type for work_type in work_types}
 
 
 class ExtraWorkTypeDAO:
     def __init__(self, db_name='prod'):
-        self.connection = sqlite3.connect(db_name)
+        self.db_name = db_name
+        self.connection = get_connection(db_name)
         self.cursor = self.connection.cursor()
-        self.create_table()
-
-    def create_table(self):
-        """Создает таблицу extra_work_type, если она не существует."""
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS extra_work_type (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                description TEXT NOT NULL,
-                payment REAL,
-                type TEXT
-            )
-        ''')
-        self.connection.commit()
+        # Справочник типов работ кэшируется один раз на процесс и базу данных
+        self.catalog = get_versioned_cache(database_key(db_name, self.connection), 'extra_work_type', _load_catalog)
+        self._catalog_seen = {}
 
     def create_extra_work_type(self, description, payment, type):
         """Создает новую запись типа дополнительной работы."""
@@ -26,16 +33,44 @@ class ExtraWorkTypeDAO:
             VALUES (?, ?, ?)
         ''', (description, payment, type))
         self.connection.commit()
+        self.catalog.invalidate()
+        notify(self.db_name, 'extra_work_type')
+
+    def create_extra_work_types_many(self, work_types: Iterable[Tuple[str, float, str]]) -> List[int]:
+        """Пакетно создает типы работ из кортежей (description, payment, type). Возвращает их ID."""
+        try:
+            return insert_many(self.connection, '''
+                INSERT INTO extra_work_type (description, payment, type)
+                VALUES (?, ?, ?)
+            ''', work_types)
+        finally:
+            self.catalog.invalidate()
+            notify(self.db_name, 'extra_work_type')
+
+    def get_extra_work_type(self, extra_work_type_id) -> Optional[ExtraWorkType]:
+        """Возвращает запись типа дополнительной работы по ID из кэша справочника."""
+        return self.catalog.get(self.cursor, self._catalog_seen)[1].get(extra_work_type_id)
 
-    def get_extra_work_type(self, extra_work_type_id):
-        """Возвращает запись типа дополнительной работы по ID."""
-        self.cursor.execute('SELECT * FROM extra_work_type WHERE id = ?', (extra_work_type_id,))
-        return self.cursor.fetchone()
+    def get_all_extra_work_types(self) -> List[ExtraWorkType]:
+        """Возвращает все записи типов дополнительной работы из кэша справочника."""
+        return list(self.catalog.get(self.cursor, self._catalog_seen)[0])
 
-    def get_all_extra_work_types(self):
-        """Возвращает все записи типов дополнительной работы."""
-        self.cursor.execute('SELECT * FROM extra_work_type')
-        return self.cursor.fetchall()
+    def search_extra_work_types(self, text: str, limit: int = SEARCH_LIMIT) -> List[ExtraWorkType]:
+        """Ищет типы работ по началу слов названия и описания; совпадения в названии важнее."""
+        query = prefix_query(text)
+        if query is None:
+            return []
+        cursor = self.connection.cursor()
+        cursor.row_factory = ExtraWorkType.row_factory
+        cursor.execute('''
+            SELECT t.id, t.description, t.payment, t.type
+            FROM extra_work_type_fts f
+            JOIN extra_work_type t ON t.id = f.rowid
+            WHERE extra_work_type_fts MATCH ?
+            ORDER BY bm25(extra_work_type_fts, 10.0, 1.0)
+            LIMIT ?
+        ''', (query, limit))
+        return cursor.fetchall()
 
     def update_extra_work_type(self, extra_work_type_id, description=None, payment=None, type=None):
         """Обновляет запись типа дополнительной работы по ID."""
@@ -61,15 +96,20 @@ class ExtraWorkTypeDAO:
                 WHERE id = ?
             ''', values)
             self.connection.commit()
+            self.catalog.invalidate()
+            notify(self.db_name, 'extra_work_type')
 
     def delete_extra_work_type(self, extra_work_type_id):
         """Удаляет запись типа дополнительной работы по ID."""
         self.cursor.execute('DELETE FROM extra_work_type WHERE id = ?', (extra_work_type_id,))
         self.connection.commit()
+        self.catalog.invalidate()
+        notify(self.db_name, 'extra_work_type')
 
     def drop_table(self):
         self.cursor.execute('DELETE FROM extra_work_type')
+        self.catalog.invalidate()
 
     def close(self):
-        """Закрывает соединение с базой данных."""
-        self.connection.close()
\ No newline at end of file
+        """Освобождает общее соединение с базой данных."""
+        release_connection(self.db_name)
\ No newline at end of file
@@ -1,148 +1,150 @@
-import sqlite3
-from typing import Optional, List
+from collections import defaultdict
+from typing import Optional, List, Tuple, Dict, Iterable
 
+from dao.cache import LRUCache, get_versioned_cache
+from dao.connection import database_key, get_connection, release_connection
+from dao.notifications import notify
+from dao.search import SEARCH_LIMIT, prefix_query
 from entity.post import Post
 from entity.worker import Worker
 
 
+WORKER_COLUMNS = '''
+    w.id, w.full_name, w.sex, w.phone_number, w.passport_number, w.passport_series, w.balance, p.id, p.title
+'''
+
+
+# Размер и время жизни (в секундах) общего кэша объектов Worker
+WORKER_CACHE_SIZE = 1024
+WORKER_CACHE_TTL = 60.0
+
+
+def _new_worker_cache(cursor) -> LRUCache:
+    return LRUCache(WORKER_CACHE_SIZE, WORKER_CACHE_TTL)
+
+
 class WorkerDAO:
     def __init__(self, db_name='prod'):
-        self.connection = sqlite3.connect(db_name)
+        self.db_name = db_name
+        self.connection = get_connection(db_name)
         self.cursor = self.connection.cursor()
-        self.create_tables()
-
-    def create_tables(self):
-        """Создает таблицы worker, post, duties и post_duties, если они не существуют."""
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS post (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT NOT NULL
-            )
-        ''')
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS duties (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                description TEXT NOT NULL
-            )
-        ''')
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS post_duties (
-                post_id INTEGER,
-                duty_id INTEGER,
-                PRIMARY KEY (post_id, duty_id),
-                FOREIGN KEY (post_id) REFERENCES post(id),
-                FOREIGN KEY (duty_id) REFERENCES duties(id)
-            )
-        ''')
-        self.cursor.execute('''
-            CREATE TABLE IF NOT EXISTS worker (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                full_name TEXT NOT NULL,
-                sex TEXT,
-                phone_number TEXT,
-                passport_number TEXT,
-                passport_series TEXT,
-                post_id INTEGER,
-                balance REAL DEFAULT 0.0,
-                FOREIGN KEY (post_id) REFERENCES post(id)
-            )
-        ''')
-        self.connection.commit()
+        # Кэш работников общий для процесса; при изменении данных работников в базе он создается заново
+        self.worker_cache = get_versioned_cache(database_key(db_name, self.connection), 'worker', _new_worker_cache)
+        self._worker_cache_seen = {}
 
     def get_worker(self, worker_id: int) -> Optional[Worker]:
-        """Возвращает объект Worker с информацией о должности и обязанностях."""
-        self.cursor.execute('''
-            SELECT w.id, w.full_name, w.sex, w.phone_number, w.passport_number, w.passport_series, w.balance, p.id, p.title
+        """Возвращает объект Worker с информацией о должности и обязанностях; повторные вызовы обслуживаются из кэша."""
+        cache = self._cache()
+        worker = cache.get(worker_id)
+        if worker is not None:
+            return worker
+
+        self.cursor.execute(f'''
+            SELECT {WORKER_COLUMNS}
             FROM worker w
             JOIN post p ON w.post_id = p.id
             WHERE w.id = ?
         ''', (worker_id,))
-        worker_row = self.cursor.fetchone()
+        workers = self._build_workers(self.cursor.fetchall())
+        if not workers:
+            return None
+        cache.put(worker_id, workers[0])
+        return workers[0]
 
-        if worker_row:
-            worker_id, full_name, sex, phone_number, passport_number, passport_series, balance, post_id, post_title = worker_row
+    def get_worker_by_name(self, full_name: str) -> Optional[Worker]:
+        """Возвращает объект Worker по полному имени."""
+        self.cursor.execute('SELECT id FROM worker WHERE full_name = ? LIMIT 1', (full_name,))
+        row = self.cursor.fetchone()
+        return self.get_worker(row[0]) if row else None
 
-            # Получаем обязанности для должности
-            self.cursor.execute('''
-                SELECT d.description
-                FROM duties d
-                JOIN post_duties pd ON d.id = pd.duty_id
-                WHERE pd.post_id = ?
-            ''', (post_id,))
-            duties = [row[0] for row in self.cursor.fetchall()]
+    def get_all_workers(self) -> List[Worker]:
+        """Возвращает список всех работников с информацией о должности и обязанностях."""
+        self.cursor.execute(f'''
+            SELECT {WORKER_COLUMNS}
+            FROM worker w
+            JOIN post p ON w.post_id = p.id
+        ''')
+        workers = self._build_workers(self.cursor.fetchall(), all_posts=True)
+        cache = self._cache()
+        for worker in workers:
+            cache.put(worker.id, worker)
+        return workers
 
-            post = Post(id=post_id, title=post_title, duties=duties)
-            worker = Worker(
-                id=worker_id,
-                full_name=full_name,
-                sex=sex,
-                phone_number=phone_number,
-                passport_number=passport_number,
-                passport_series=passport_series,
-                post=post,
-                balance=balance
-            )
-            return worker
-        return None
+    def get_worker_names(self) -> List[Tuple[int, str]]:
+        """Возвращает (id, полное имя) всех работников: только то, что нужно для списка выбора."""
+        self.cursor.execute('SELECT id, full_name FROM worker')
+        return self.cursor.fetchall()
 
-    def get_worker_by_name(self, full_name: str) -> Optional[Worker]:
-        """Возвращает объект Worker по полному имени."""
+    def get_worker_summaries(self) -> List[Tuple[int, str, str]]:
+        """Возвращает (id, полное имя, название должности) всех работников без загрузки обязанностей."""
         self.cursor.execute('''
-            SELECT w.id, w.full_name, w.sex, w.phone_number, w.passport_number, w.passport_series, w.balance, p.id, p.title
+            SELECT w.id, w.full_name, p.title
             FROM worker w
             JOIN post p ON w.post_id = p.id
-            WHERE w.full_name = ?
-        ''', (full_name,))
-        worker_row = self.cursor.fetchone()
-
-        if worker_row:
-            worker_id, full_name, sex, phone_number, passport_number, passport_series, balance, post_id, post_title = worker_row
+        ''')
+        return self.cursor.fetchall()
 
-            # Получаем обязанности для должности
+    def search_workers(self, text: str, limit: int = SEARCH_LIMIT) -> List[Tuple[int, str, str]]:
+        """Ищет работников по началу слов имени; возвращает (id, полное имя, название должности) по релевантности."""
+        query = prefix_query(text)
+        if query is None:
+            return []
+        self.cursor.execute('''
+            SELECT w.id, w.full_name, p.title
+            FROM worker_fts f
+            JOIN worker w ON w.id = f.rowid
+            JOIN post p ON w.post_id = p.id
+            WHERE worker_fts MATCH ?
+            ORDER BY bm25(worker_fts)
+            LIMIT ?
+        ''', (query, limit))
+        return self.cursor.fetchall()
+
+    def get_duties_by_post(self, post_ids: Optional[Iterable[int]] = None) -> Dict[int, List[str]]:
+        """Возвращает обязанности, сгруппированные по ID должности, одним запросом."""
+        if post_ids is None:
             self.cursor.execute('''
-                SELECT d.description
+                SELECT pd.post_id, d.description
+                FROM duties d
+                JOIN post_duties pd ON d.id = pd.duty_id
+            ''')
+        else:
+            post_ids = list(post_ids)
+            placeholders = ', '.join('?' * len(post_ids))
+            self.cursor.execute(f'''
+                SELECT pd.post_id, d.description
                 FROM duties d
                 JOIN post_duties pd ON d.id = pd.duty_id
-                WHERE pd.post_id = ?
-            ''', (post_id,))
-            duties = [row[0] for row in self.cursor.fetchall()]
+                WHERE pd.post_id IN ({placeholders})
+            ''', post_ids)
 
-            post = Post(id=post_id, title=post_title, duties=duties)
-            worker = Worker(
-                id=worker_id,
-                full_name=full_name,
-                sex=sex,
-                phone_number=phone_number,
-                passport_number=passport_number,
-                passport_series=passport_series,
-                post=post,
-                balance=balance
-            )
-            return worker
-        return None
+        duties_by_post = defaultdict(list)
+        for post_id, description in self.cursor.fetchall():
+            duties_by_post[post_id].append(description)
+        return duties_by_post
 
-    def get_all_workers(self) -> List[Worker]:
-        """Возвращает список всех работников с информацией о должности и обязанностях."""
-        self.cursor.execute('''
-            SELECT w.id, w.full_name, w.sex, w.phone_number, w.passport_number, w.passport_series, w.balance, p.id, p.title
-            FROM worker w
-            JOIN post p ON w.post_id = p.id
-        ''')
+    def _cache(self) -> LRUCache:
+        return self.worker_cache.get(self.cursor, self._worker_cache_seen)
+
+    def _build_workers(self, worker_rows: List[Tuple], all_posts: bool = False) -> List[Worker]:
+        """Собирает объекты Worker; работники одной должности разделяют один объект Post."""
+        if not worker_rows:
+            return []
+
+        post_ids = None if all_posts else {row[7] for row in worker_rows}
+        duties_by_post = self.get_duties_by_post(post_ids)
+
+        posts = {}
         workers = []
-        for worker_row in self.cursor.fetchall():
+        for worker_row in worker_rows:
             worker_id, full_name, sex, phone_number, passport_number, passport_series, balance, post_id, post_title = worker_row
 
-            # Получаем обязанности для должности
-            self.cursor.execute('''
-                SELECT d.description
-                FROM duties d
-                JOIN post_duties pd ON d.id = pd.duty_id
-                WHERE pd.post_id = ?
-            ''', (post_id,))
-            duties = [row[0] for row in self.cursor.fetchall()]
+            post = posts.get(post_id)
+            if post is None:
+                post = Post(id=post_id, title=post_title, duties=duties_by_post.get(post_id, []))
+                posts[post_id] = post
 
-            post = Post(id=post_id, title=post_title, duties=duties)
-            worker = Worker(
+            workers.append(Worker(
                 id=worker_id,
                 full_name=full_name,
                 sex=sex,
@@ -151,8 +153,7 @@ class WorkerDAO:
                 passport_series=passport_series,
                 post=post,
                 balance=balance
-            )
-            workers.append(worker)
+            ))
         return workers
 
     def update_worker_balance(self, worker_id: int, new_balance: float):
@@ -163,7 +164,9 @@ class WorkerDAO:
             WHERE id = ?
         ''', (new_balance, worker_id))
         self.connection.commit()
+        notify(self.db_name, 'worker')
+        self._cache().pop(worker_id)
 
     def close(self):
-        """Закрывает соединение с базой данных."""
-        self.connection.close()
\ No newline at end of file
+        """Освобождает общее соединение с базой данных."""
+        release_connection(self.db_name)
\ No newline at end of file
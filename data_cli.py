@@ -0,0 +1,296 @@
+import argparse
+import csv
+import json
+import logging
+import sqlite3
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TextIO
+
+from dao.bulk import CHUNK_SIZE, chunked, execute_many
+from dao.connection import connect
+from dao.notifications import notify
+
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('csv', 'jsonl')
+# Разделитель обязанностей должности в одной ячейке CSV
+DUTIES_SEPARATOR = ';'
+# Размер кэша страниц соединения загрузки в КиБ: индексы большой таблицы не вытесняют друг друга
+IMPORT_CACHE_KIB = 256 * 1024
+
+
+@contextmanager
+def _open(path: str, mode: str) -> Iterator[TextIO]:
+    """Открывает файл или stdin/stdout, если путь равен "-"."""
+    if path == '-':
+        yield sys.stdin if mode == 'r' else sys.stdout
+    else:
+        with open(path, mode, encoding='utf-8', newline='') as file:
+            yield file
+
+
+def _format(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    if path.endswith('.csv'):
+        return 'csv'
+    if path.endswith('.jsonl'):
+        return 'jsonl'
+    raise SystemExit(f'Не удалось определить формат файла {path}: укажите --format')
+
+
+def read_records(file: TextIO, fmt: str) -> Iterator[dict]:
+    """Читает записи из CSV с заголовком или из JSONL по одной, не загружая файл в память."""
+    if fmt == 'csv':
+        for record in csv.DictReader(file):
+            # Пустая ячейка CSV означает NULL
+            yield {key: (value if value != '' else None) for key, value in record.items()}
+    else:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
+
+
+def write_records(file: TextIO, fmt: str, columns: Sequence[str], rows: Iterable[Sequence]) -> int:
+    """Пишет строки в CSV с заголовком или в JSONL по одной. Возвращает число строк."""
+    count = 0
+    if fmt == 'csv':
+        writer = csv.writer(file)
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    else:
+        for row in rows:
+            file.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False))
+            file.write('\n')
+            count += 1
+    return count
+
+
+class Importer:
+    """Загружает записи в таблицы базы данных пачками, по одной транзакции на пачку.
+
+    Внешние ключи можно задать как ID (post_id, assignee, client_id, extra_work_type_id)
+    или по естественному ключу (post, assignee_name, client_phone, work_type); естественные
+    ключи переводятся в ID через словари, один раз построенные по базе данных.
+    """
+
+    def __init__(self, connection: sqlite3.Connection, chunk_size: int = CHUNK_SIZE):
+        self.connection = connection
+        self.chunk_size = chunk_size
+        self._maps: Dict[str, dict] = {}
+
+    def _map(self, name: str, sql: str) -> dict:
+        if name not in self._maps:
+            self._maps[name] = {key: value for key, value in self.connection.execute(sql)}
+        return self._maps[name]
+
+    def post_ids(self) -> Dict[str, int]:
+        return self._map('post', 'SELECT title, id FROM post')
+
+    def duty_ids(self) -> Dict[str, int]:
+        return self._map('duties', 'SELECT description, id FROM duties')
+
+    def worker_ids(self) -> Dict[str, int]:
+        return self._map('worker', 'SELECT full_name, id FROM worker')
+
+    def client_ids(self) -> Dict[str, int]:
+        return self._map('client', 'SELECT phone_number, id FROM client')
+
+    def work_types(self) -> Dict[str, tuple]:
+        """Возвращает (ID, название типа) по описанию типа работы."""
+        if 'extra_work_type' not in self._maps:
+            self._maps['extra_work_type'] = {
+                description: (type_id, type_name)
+                for type_id, description, type_name in
+                self.connection.execute('SELECT id, description, type FROM extra_work_type')
+            }
+        return self._maps['extra_work_type']
+
+    def _execute(self, sql: str, rows: Iterable[Sequence]) -> int:
+        return execute_many(self.connection, sql, rows, self.chunk_size)
+
+    def client(self, records: Iterable[dict]) -> int:
+        return self._execute('''
+            INSERT INTO client (first_name, last_name, phone_number) VALUES (?, ?, ?)
+        ''', ((r.get('first_name'), r.get('last_name'), r.get('phone_number')) for r in records))
+
+    def extra_work_type(self, records: Iterable[dict]) -> int:
+        return self._execute('''
+            INSERT INTO extra_work_type (description, payment, type) VALUES (?, ?, ?)
+        ''', ((r['description'], _float(r.get('payment')), r.get('type')) for r in records))
+
+    def worker(self, records: Iterable[dict]) -> int:
+        post_ids = self.post_ids()
+        return self._execute('''
+            INSERT INTO worker (full_name, sex, phone_number, passport_number, passport_series, post_id, balance)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', ((r['full_name'], r.get('sex'), r.get('phone_number'), r.get('passport_number'),
+               r.get('passport_series'), _resolve(r, 'post_id', 'post', post_ids),
+               _float(r.get('balance')) or 0.0) for r in records))
+
+    def extra_work(self, records: Iterable[dict]) -> int:
+        worker_ids, client_ids, work_types = self.worker_ids(), self.client_ids(), self.work_types()
+
+        def rows():
+            for r in records:
+                type_id, type_name = r.get('extra_work_type_id'), r.get('type')
+                if type_id is None and r.get('work_type') is not None:
+                    type_id, default_name = _lookup(work_types, 'work_type', r['work_type'])
+                    type_name = type_name or default_name
+                yield (type_name, r.get('start_time'), r.get('end_time'),
+                       _resolve(r, 'assignee', 'assignee_name', worker_ids), type_id,
+                       r.get('status') or 'pending', _resolve(r, 'client_id', 'client_phone', client_ids))
+
+        return self._execute('''
+            INSERT INTO extra_work (type, start_time, end_time, assignee, extra_work_type_id, status, client_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows())
+
+    def post(self, records: Iterable[dict]) -> int:
+        """Добавляет должности вместе с обязанностями; одинаковые должности и обязанности хранятся один раз."""
+        post_ids, duty_ids = self.post_ids(), self.duty_ids()
+        cursor = self.connection.cursor()
+        count = 0
+        for chunk in chunked(records, self.chunk_size):
+            cursor.execute('BEGIN IMMEDIATE')
+            try:
+                for record in chunk:
+                    if record['title'] not in post_ids:
+                        cursor.execute('INSERT INTO post (title) VALUES (?)', (record['title'],))
+                        post_ids[record['title']] = cursor.lastrowid
+                    post_id = post_ids[record['title']]
+                    for duty in _duties(record.get('duties')):
+                        if duty not in duty_ids:
+                            cursor.execute('INSERT INTO duties (description) VALUES (?)', (duty,))
+                            duty_ids[duty] = cursor.lastrowid
+                        cursor.execute('INSERT OR IGNORE INTO post_duties (post_id, duty_id) VALUES (?, ?)',
+                                       (post_id, duty_ids[duty]))
+                self.connection.commit()
+            except Exception:
+                self.connection.rollback()
+                # Словари могли получить ID из отмененной транзакции
+                self._maps.pop('post', None)
+                self._maps.pop('duties', None)
+                raise
+            count += len(chunk)
+        return count
+
+
+# Таблицы, которые можно загрузить, и способ загрузки каждой из них
+IMPORTS: Dict[str, Callable[[Importer, Iterable[dict]], int]] = {
+    'client': Importer.client,
+    'post': Importer.post,
+    'worker': Importer.worker,
+    'extra_work_type': Importer.extra_work_type,
+    'extra_work': Importer.extra_work,
+}
+
+
+def _float(value) -> Optional[float]:
+    return None if value is None else float(value)
+
+
+def _duties(value) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        value = value.split(DUTIES_SEPARATOR)
+    return [duty.strip() for duty in value if duty and duty.strip()]
+
+
+def _lookup(mapping: dict, column: str, key):
+    try:
+        return mapping[key]
+    except KeyError:
+        raise ValueError(f'{column}: не найдено значение {key!r}') from None
+
+
+def _resolve(record: dict, id_column: str, key_column: str, mapping: dict) -> Optional[int]:
+    """Возвращает ID из записи или переводит в ID естественный ключ."""
+    if record.get(id_column) is not None:
+        return int(record[id_column])
+    if record.get(key_column) is not None:
+        return _lookup(mapping, key_column, record[key_column])
+    return None
+
+
+@contextmanager
+def deferred_indexes(connection: sqlite3.Connection, table: str):
+    """Удаляет вторичные индексы таблицы на время загрузки и строит их заново после нее.
+
+    Построение индекса сортировкой быстрее вставки каждой строки в несколько B-деревьев,
+    но пока идет загрузка, запросы к таблице выполняются без индексов.
+    """
+    indexes = connection.execute(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+        (table,)).fetchall()
+    for name, _ in indexes:
+        connection.execute(f'DROP INDEX "{name}"')
+    connection.commit()
+    try:
+        yield
+    finally:
+        for _, sql in indexes:
+            connection.execute(sql)
+        connection.commit()
+
+
+def export_table(connection: sqlite3.Connection, table: str, file: TextIO, fmt: str) -> int:
+    """Выгружает таблицу или представление построчно. Возвращает число строк."""
+    known = {name for name, in connection.execute(
+        "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')")}
+    if table not in known:
+        raise SystemExit(f'Таблица {table} не найдена')
+    cursor = connection.execute(f'SELECT * FROM "{table}"')
+    columns = [column[0] for column in cursor.description]
+    return write_records(file, fmt, columns, cursor)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Пакетная загрузка и выгрузка данных в CSV и JSONL')
+    parser.add_argument('--db', default='prod', help='файл базы данных')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    load = commands.add_parser('import', help='загрузить записи в таблицу')
+    load.add_argument('table', choices=sorted(IMPORTS))
+    load.add_argument('file', help='файл CSV или JSONL; "-" - стандартный ввод')
+    load.add_argument('--format', choices=FORMATS)
+    load.add_argument('--chunk-size', type=int, default=CHUNK_SIZE, help='строк в одной транзакции')
+    load.add_argument('--rebuild-indexes', action='store_true',
+                      help='удалить индексы таблицы на время загрузки и построить их заново')
+
+    dump = commands.add_parser('export', help='выгрузить таблицу')
+    dump.add_argument('table')
+    dump.add_argument('file', help='файл CSV или JSONL; "-" - стандартный вывод')
+    dump.add_argument('--format', choices=FORMATS)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    fmt = _format(args.file, args.format) if args.file != '-' or args.format else 'jsonl'
+    connection = connect(args.db)
+    started = time.perf_counter()
+    try:
+        if args.command == 'import':
+            connection.execute(f'PRAGMA cache_size = -{IMPORT_CACHE_KIB}')
+            indexes = deferred_indexes(connection, args.table) if args.rebuild_indexes else nullcontext()
+            with _open(args.file, 'r') as file, indexes:
+                count = IMPORTS[args.table](Importer(connection, args.chunk_size), read_records(file, fmt))
+            # Обновляет статистику планировщика после крупной загрузки
+            connection.execute('PRAGMA optimize')
+            notify(args.db, args.table)
+            logger.info('Загружено строк в %s: %d за %.2f с', args.table, count, time.perf_counter() - started)
+        else:
+            with _open(args.file, 'w') as file:
+                count = export_table(connection, args.table, file, fmt)
+            logger.info('Выгружено строк из %s: %d за %.2f с', args.table, count, time.perf_counter() - started)
+    finally:
+        connection.close()
+
+
+if __name__ == "__main__":
+    main()
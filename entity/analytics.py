@@ -0,0 +1,31 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class CompletionTimes:
+    """Время выполнения заявок группы (типа работы или работника) в секундах: среднее и перцентили."""
+    key_id: int
+    name: Optional[str]
+    count: int
+    average_seconds: float
+    median_seconds: int
+    p90_seconds: int
+    p99_seconds: int
+    max_seconds: int
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class DailyThroughput:
+    """Число завершенных за день заявок и сумма оплаты по ним."""
+    day: str
+    completed: int
+    amount: float
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        return cls(*row)
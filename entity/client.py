@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class Client:
+    id: int
+    first_name: str
+    last_name: str
+    phone_number: str
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        return cls(*row)
@@ -0,0 +1,29 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class StatusSummary:
+    """Число заявок в статусе и сумма оплаты по ним."""
+    status: str
+    count: int
+    amount: float
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class WorkerTotals:
+    """Итоги работника: заявки в работе, выполненные и оплаченные, неоплаченная и заработанная суммы."""
+    worker_id: int
+    full_name: str
+    in_progress_count: int
+    done_count: int
+    paid_count: int
+    unpaid_amount: float
+    earned_amount: float
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        return cls(*row)
@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class ExtraWork:
+    id: int
+    type: str
+    start_time: Optional[str]
+    end_time: Optional[str]
+    assignee: Optional[int]
+    extra_work_type_id: int
+    status: str
+    client_id: int
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        return cls(*row)
+
+
+@dataclass(slots=True)
+class ExtraWorkDetails(ExtraWork):
+    """Заявка вместе с названием типа работы, оплатой, исполнителем, его должностью и временем выполнения."""
+    work_type_name: Optional[str]
+    payment: Optional[float]
+    worker_full_name: Optional[str]
+    post_title: Optional[str]
+    duration_seconds: Optional[int]
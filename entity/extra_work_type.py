@@ -0,0 +1,13 @@
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class ExtraWorkType:
+    id: int
+    description: str
+    payment: float
+    type: str
+
+    @classmethod
+    def row_factory(cls, cursor, row):
+        return cls(*row)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 from typing import List
 
-@dataclass
+@dataclass(slots=True)
 class Post:
     id: int
     title: str
@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from entity.post import Post
 
 
-@dataclass
+@dataclass(slots=True)
 class Worker:
     id: int
     full_name: str
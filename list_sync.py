@@ -0,0 +1,69 @@
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QListWidget, QListWidgetItem
+
+
+# Роль, в которой элемент хранит имя своего цвета, чтобы не перекрашивать его без изменений
+_COLOR_ROLE = Qt.UserRole + 1
+
+
+class KeyedListSync:
+    """Держит строки QListWidget упорядоченными по ключу и меняет только затронутые строки.
+
+    Элементы не пересоздаются, поэтому выделение и позиция прокрутки сохраняются.
+    """
+
+    def __init__(self, list_widget: QListWidget):
+        self.list_widget = list_widget
+        self._keys: List[int] = []
+        self._items: Dict[int, QListWidgetItem] = {}
+        self._colors: Dict[str, QColor] = {}
+
+    def upsert(self, key: int, text: str, color: Optional[str] = None):
+        """Добавляет строку с ключом key или обновляет ее текст и цвет, если они изменились."""
+        item = self._items.get(key)
+        if item is None:
+            item = QListWidgetItem(text)
+            self._set_color(item, color)
+            position = bisect_left(self._keys, key)
+            self._keys.insert(position, key)
+            self._items[key] = item
+            self.list_widget.insertItem(position, item)
+            return
+
+        if item.text() != text:
+            item.setText(text)
+        self._set_color(item, color)
+
+    def remove(self, key: int):
+        """Удаляет строку с ключом key, если она есть."""
+        if self._items.pop(key, None) is None:
+            return
+        position = bisect_left(self._keys, key)
+        del self._keys[position]
+        self.list_widget.takeItem(position)
+
+    def remove_many(self, keys: Iterable[int]):
+        """Удаляет строки с указанными ключами."""
+        for key in keys:
+            self.remove(key)
+
+    def key_at(self, row: int) -> Optional[int]:
+        """Возвращает ключ строки row или None."""
+        if 0 <= row < len(self._keys):
+            return self._keys[row]
+        return None
+
+    def _set_color(self, item: QListWidgetItem, color: Optional[str]):
+        if color is None:
+            return
+        if item.data(_COLOR_ROLE) == color:
+            return
+        qcolor = self._colors.get(color)
+        if qcolor is None:
+            qcolor = self._colors[color] = QColor(color)
+        item.setBackground(qcolor)
+        item.setData(_COLOR_ROLE, color)
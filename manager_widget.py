@@ -1,18 +1,20 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem, QLineEdit
-from PyQt5.QtGui import QColor
-from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem, QLineEdit, QTableView, QAbstractItemView, QHeaderView
+from PyQt5.QtCore import Qt, QTimer
 from datetime import datetime
 
+from change_notifier import ChangeNotifier
+from dao.connection import thread_dao
+from dao.dashboard import DashboardDAO
+from dao.dispatch import DispatchDAO
 from dao.extra_work import ExtraWorkDAO
-from dao.type import ExtraWorkTypeDAO
 from dao.worker import WorkerDAO
+from query_executor import QueryExecutor
+from request_model import RequestTableModel
 
 
 class ManagerWindow(QWidget):
 
-    extra_work_dao: ExtraWorkDAO
-    worker_dao: WorkerDAO
-    work_type_dao: ExtraWorkTypeDAO
+    executor: QueryExecutor
 
     def __init__(self, db_name='prod'):
         super().__init__()
@@ -20,38 +22,68 @@ class ManagerWindow(QWidget):
         self.setWindowTitle("Менеджер")
         self.setGeometry(100, 100, 800, 600)
 
-        # Инициализация DAO
-        self.extra_work_dao = ExtraWorkDAO(db_name)
-        self.worker_dao = WorkerDAO(db_name)
-        self.work_type_dao = ExtraWorkTypeDAO(db_name)
+        # Все запросы к базе данных выполняются в потоке исполнителя, DAO создаются в нем же
+        self.db_name = db_name
+        self.executor = QueryExecutor(self)
 
         # Основной лейаут
         main_layout = QHBoxLayout()
 
         # Левый лейаут для списка заявок
-        self.request_list = QListWidget()
-        self.request_list.currentItemChanged.connect(self.display_selected_request)
-        self.current_requests = []  # Хранит текущее состояние списка заявок
-        self.load_requests()
-        main_layout.addWidget(self.request_list)
+        # Курсор фиксируется до загрузки первой страницы, чтобы не пропустить изменения;
+        # исполнитель выполняет запросы по порядку, поэтому он будет прочитан раньше страницы
+        self.change_cursor = None
+        self.executor.submit(
+            'requests',
+            lambda: self.dao(ExtraWorkDAO).get_extra_work_change_cursor(),
+            self.set_change_cursor
+        )
+        self.request_model = RequestTableModel(
+            lambda after_id, limit: self.dao(ExtraWorkDAO).get_extra_work_details_page(after_id, limit),
+            executor=self.executor
+        )
+        self.request_view = QTableView()
+        self.request_view.setModel(self.request_model)
+        self.request_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.request_view.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.request_view.verticalHeader().hide()
+        # Фиксированная высота строк избавляет представление от измерения каждой строки
+        self.request_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.request_view.horizontalHeader().setStretchLastSection(True)
+        self.request_view.selectionModel().currentRowChanged.connect(self.display_selected_request)
+        self.request_model.fetchMore()
+        main_layout.addWidget(self.request_view)
 
         # Центральная панель для отображения выбранной заявки и работника
         self.selected_request_label = QLabel("Выбранная заявка: None")
         self.selected_worker_label = QLabel("Выбранный работник: None")
         self.assign_button = QPushButton("Назначить")
         self.assign_button.clicked.connect(self.assign_work)
+        self.auto_dispatch_button = QPushButton("Распределить все заявки")
+        self.auto_dispatch_button.clicked.connect(self.auto_dispatch)
+        self.auto_dispatch_label = QLabel()
 
         center_layout = QVBoxLayout()
         center_layout.addWidget(self.selected_request_label)
         center_layout.addWidget(self.selected_worker_label)
         center_layout.addWidget(self.assign_button)
+        center_layout.addWidget(self.auto_dispatch_button)
+        center_layout.addWidget(self.auto_dispatch_label)
         main_layout.addLayout(center_layout)
 
-        # Правый лейаут для списка работников
+        # Правый лейаут для поиска и списка работников
+        self.worker_search = QLineEdit()
+        self.worker_search.setPlaceholderText("Поиск работника")
+        self.worker_search.textChanged.connect(self.load_workers)
         self.worker_list = QListWidget()
+        self.shown_workers = None
         self.worker_list.currentItemChanged.connect(self.display_selected_worker)
         self.load_workers()
-        main_layout.addWidget(self.worker_list)
+
+        worker_layout = QVBoxLayout()
+        worker_layout.addWidget(self.worker_search)
+        worker_layout.addWidget(self.worker_list)
+        main_layout.addLayout(worker_layout)
 
         # Нижняя панель для отображения имени исполнителя и кнопки оплаты
         self.worker_name_field = QLineEdit()
@@ -65,74 +97,128 @@ class ManagerWindow(QWidget):
         bottom_layout.addWidget(self.pay_button)
         main_layout.addLayout(bottom_layout)
 
+        # Панель сводки: читает только сводные таблицы, поэтому не зависит от размера истории заявок
+        self.status_summary_label = QLabel()
+        self.outstanding_label = QLabel()
+        self.worker_totals_list = QListWidget()
+
+        dashboard_layout = QVBoxLayout()
+        dashboard_layout.addWidget(QLabel("Сводка по заявкам:"))
+        dashboard_layout.addWidget(self.status_summary_label)
+        dashboard_layout.addWidget(self.outstanding_label)
+        dashboard_layout.addWidget(QLabel("Итоги работников:"))
+        dashboard_layout.addWidget(self.worker_totals_list)
+        main_layout.addLayout(dashboard_layout)
+        self.load_dashboard()
+
         # Устанавливаем основной лейаут
         self.setLayout(main_layout)
 
-        # Устанавливаем таймер для автоматического обновления списка заявок
+        # Таймер опрашивает базу данных, только пока недоступен концентратор уведомлений
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.load_requests)
-        self.timer.start(4000)  # Обновление каждые 4000 миллисекунд (4 секунды)
+        self.timer.timeout.connect(self.load_dashboard)
+        self.notifier = ChangeNotifier(self.db_name, self.timer, self)
+        self.notifier.changed.connect(self.on_tables_changed)
+        self.notifier.start()
+
+    def dao(self, dao_class):
+        """Возвращает DAO потока исполнителя; вызывается только внутри запросов исполнителя."""
+        return thread_dao(dao_class, self.db_name)
+
+    def set_change_cursor(self, cursor):
+        self.change_cursor = cursor
+        self.notifier.loaded()
 
     def load_requests(self):
-        """Загружает и отображает список всех заявок."""
-        requests = self.extra_work_dao.get_all_extra_works()
-        new_requests = []
-
-        for request in requests:
-            extra_work_type_id = request[5]
-            work_type = self.work_type_dao.get_extra_work_type(extra_work_type_id)
-            work_type_name = work_type[3] if work_type else "Неизвестно"
-
-            item_text = f"ID: {request[0]}, Тип Работы: {work_type_name}, Статус: {request[6]}"
-            new_requests.append(item_text)
-
-        # Проверяем, изменился ли список заявок
-        if new_requests != self.current_requests:
-            self.current_requests = new_requests
-            self.request_list.clear()
-            for item_text in new_requests:
-                item = QListWidgetItem(item_text)
-
-                # Устанавливаем цвет фона в зависимости от статуса
-                if "Статус: pending" in item_text:
-                    item.setBackground(QColor("yellow"))
-                elif "Статус: in progress" in item_text:
-                    item.setBackground(QColor("orange"))  # Изменяем цвет на оранжевый
-                elif "Статус: done" in item_text:
-                    item.setBackground(QColor("green"))
-                elif "Статус: paid" in item_text:
-                    item.setBackground(QColor("grey"))  # Цвет для оплаченной работы
-
-                self.request_list.addItem(item)
+        """Запрашивает изменения заявок, накопившиеся после последнего обновления."""
+        if self.change_cursor is None:
+            return
+        cursor = self.change_cursor
+        self.executor.submit(
+            'requests',
+            lambda: self.dao(ExtraWorkDAO).get_extra_work_details_changed_since(cursor),
+            lambda result: self.apply_request_changes(cursor, result)
+        )
+
+    def apply_request_changes(self, base_cursor, result):
+        """Применяет к модели заявок изменения, прочитанные от курсора base_cursor."""
+        if base_cursor != self.change_cursor:
+            return
+        self.change_cursor, changed, deleted = result
+        if changed or deleted:
+            self.request_model.apply_changes(changed, deleted)
+
+    def load_dashboard(self):
+        """Запрашивает сводку по статусам и итоги работников."""
+        def query():
+            dashboard = self.dao(DashboardDAO)
+            return dashboard.get_status_summary(), dashboard.get_worker_totals()
+
+        self.executor.submit('dashboard', query, self.show_dashboard)
+
+    def show_dashboard(self, result):
+        statuses, worker_totals = result
+        self.status_summary_label.setText("\n".join(
+            f"{status}: {statuses[status].count}" for status in ("pending", "in progress", "done", "paid")
+            if status in statuses
+        ))
+        outstanding = statuses["done"].amount if "done" in statuses else 0.0
+        self.outstanding_label.setText(f"К оплате: {outstanding:.2f}")
+
+        self.worker_totals_list.clear()
+        for totals in worker_totals:
+            self.worker_totals_list.addItem(
+                f"{totals.full_name}: в работе {totals.in_progress_count}, выполнено {totals.done_count}, "
+                f"оплачено {totals.paid_count}, к оплате {totals.unpaid_amount:.2f}, заработано {totals.earned_amount:.2f}"
+            )
+
+    def current_request(self):
+        """Возвращает выбранную заявку или None."""
+        index = self.request_view.currentIndex()
+        return self.request_model.row_at(index.row()) if index.isValid() else None
 
     def load_workers(self):
-        """Загружает и отображает список всех работников."""
-        workers = self.worker_dao.get_all_workers()
+        """Загружает список работников: всех или найденных по строке поиска."""
+        text = self.worker_search.text().strip()
+        if text:
+            query = lambda: self.dao(WorkerDAO).search_workers(text)
+        else:
+            query = lambda: self.dao(WorkerDAO).get_worker_summaries()
+        self.executor.submit('workers', query, self.show_workers)
+
+    def show_workers(self, workers):
+        """Перестраивает список работников, если изменились их имена или должности; выбранный работник остается выбранным."""
+        workers = [tuple(worker) for worker in workers]
+        if workers == self.shown_workers:
+            # Например, изменился только баланс после выплаты
+            return
+        self.shown_workers = workers
+
+        current = self.worker_list.currentItem()
+        selected_id = current.data(Qt.UserRole) if current else None
         self.worker_list.clear()
-        for worker in workers:
-            item_text = f"{worker.full_name} - {worker.post.title}"
+        for worker_id, full_name, post_title in workers:
+            item_text = f"{full_name} - {post_title}"
             item = QListWidgetItem(item_text)
+            item.setData(Qt.UserRole, worker_id)
             self.worker_list.addItem(item)
+            if worker_id == selected_id:
+                self.worker_list.setCurrentItem(item)
 
     def display_selected_request(self, current, previous):
         """Отображает выбранную заявку и имя исполнителя, если работа завершена."""
-        if current:
-            request_text = current.text()
-            if "Статус: done" not in request_text and "Статус: paid" not in request_text:
+        request = self.request_model.row_at(current.row()) if current.isValid() else None
+        if request:
+            request_text = f"ID: {request.id}, Тип Работы: {request.work_type_name or 'Неизвестно'}, Статус: {request.status}"
+            if request.status not in ("done", "paid"):
                 self.selected_request_label.setText(f"Выбранная заявка: {request_text}")
             else:
                 self.selected_request_label.setText("Выбранная заявка: None")
 
             # Проверяем статус работы
-            if "Статус: done" in request_text:
-                request_id = int(request_text.split(",")[0].split(":")[1].strip())
-                work = self.extra_work_dao.get_extra_work(request_id)
-                if work:
-                    worker = self.worker_dao.get_worker(work[4])
-                    if worker:
-                        self.worker_name_field.setText(worker.full_name)
-                    else:
-                        self.worker_name_field.setText("Неизвестно")
+            if request.status == "done":
+                self.worker_name_field.setText(request.worker_full_name or "Неизвестно")
             else:
                 self.worker_name_field.clear()
 
@@ -143,50 +229,84 @@ class ManagerWindow(QWidget):
 
     def assign_work(self):
         """Назначает работу выбранному работнику по выбранной заявке."""
-        current_request_item = self.request_list.currentItem()
+        request = self.current_request()
         current_worker_item = self.worker_list.currentItem()
 
-        if current_request_item and current_worker_item:
-            request_id = int(current_request_item.text().split(",")[0].split(":")[1].strip())
+        if request and current_worker_item:
+            request_id = request.id
             worker_full_name = current_worker_item.text().split(" - ")[0]
 
-            # Получаем объект работника
-            worker = self.worker_dao.get_worker_by_name(worker_full_name)
+            def assign():
+                # Получаем объект работника
+                worker = self.dao(WorkerDAO).get_worker_by_name(worker_full_name)
 
-            if worker:
-                # Устанавливаем текущее время как время начала работы
-                start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-
-                # Обновляем статус заявки, связываем с работником и фиксируем время начала
-                self.extra_work_dao.update_extra_work(
-                    request_id,
-                    status="in progress",
-                    assignee=worker.id,
-                    start_time=start_time
-                )
-
-                self.load_requests()
+                if worker:
+                    # Устанавливаем текущее время как время начала работы
+                    start_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+                    # Обновляем статус заявки, связываем с работником и фиксируем время начала
+                    self.dao(ExtraWorkDAO).update_extra_work(
+                        request_id,
+                        status="in progress",
+                        assignee=worker.id,
+                        start_time=start_time
+                    )
+
+            self.executor.submit(None, assign, lambda result: self.refresh())
+
+    def auto_dispatch(self):
+        """Назначает все ожидающие заявки наименее загруженным подходящим работникам."""
+        self.auto_dispatch_button.setEnabled(False)
+        self.executor.submit(None, lambda: self.dao(DispatchDAO).auto_dispatch(), self.show_auto_dispatch,
+                             lambda error: self.auto_dispatch_button.setEnabled(True))
+
+    def show_auto_dispatch(self, assignments):
+        self.auto_dispatch_button.setEnabled(True)
+        self.auto_dispatch_label.setText(f"Назначено заявок: {len(assignments)}")
+        self.refresh()
 
     def pay_for_work(self):
         """Начисляет оплату за работу исполнителю и переводит работу в статус paid."""
-        current_item = self.request_list.currentItem()
-        if current_item and "Статус: done" in current_item.text():
-            request_id = int(current_item.text().split(",")[0].split(":")[1].strip())
-            work = self.extra_work_dao.get_extra_work(request_id)
-            if work:
-                worker = self.worker_dao.get_worker(work[4])
-                if worker:
-                    work_type = self.work_type_dao.get_extra_work_type(work[5])
-                    if work_type:
-                        payment = work_type[2]  # Получаем сумму оплаты из поля payment
-                        new_balance = getattr(worker, 'balance', 0.0) + payment
-                        self.worker_dao.update_worker_balance(worker.id, new_balance)
-                        self.extra_work_dao.update_extra_work(request_id, status="paid")
-                        self.worker_name_field.setText(f"{worker.full_name} - Баланс обновлен")
-                        self.load_requests()
+        request = self.current_request()
+        if request and request.status == "done":
+            request_id = request.id
+
+            def pay():
+                work = self.dao(ExtraWorkDAO).get_extra_work_details(request_id)
+                if work:
+                    worker = self.dao(WorkerDAO).get_worker(work.assignee)
+                    if worker:
+                        payment = work.payment  # Сумма оплаты из типа работы
+                        if payment is not None:
+                            new_balance = getattr(worker, 'balance', 0.0) + payment
+                            self.dao(WorkerDAO).update_worker_balance(worker.id, new_balance)
+                            self.dao(ExtraWorkDAO).update_extra_work(request_id, status="paid")
+                            return worker.full_name
+                return None
+
+            self.executor.submit(None, pay, self.show_payment)
+
+    def show_payment(self, worker_full_name):
+        if worker_full_name is not None:
+            self.worker_name_field.setText(f"{worker_full_name} - Баланс обновлен")
+            self.refresh()
+
+    def on_tables_changed(self, tables):
+        """Обновляет данные, зависящие от измененных таблиц."""
+        # Изменения типов работ, работников и должностей триггеры отмечают в журнале изменений заявок
+        if tables & {"extra_work", "extra_work_type", "worker", "post"}:
+            self.refresh()
+        if "worker" in tables or "post" in tables:
+            self.load_workers()
+
+    def refresh(self):
+        """Обновляет заявки и сводку после изменений, сделанных в этом окне."""
+        self.load_requests()
+        self.load_dashboard()
 
     def closeEvent(self, event):
-        """Закрывает соединение с базой данных при закрытии окна."""
-        self.extra_work_dao.close()
-        self.worker_dao.close()
-        event.accept()
\ No newline at end of file
+        """Останавливает обновление и закрывает соединения с базой данных при закрытии окна."""
+        self.timer.stop()
+        self.notifier.close()
+        self.executor.close()
+        event.accept()
@@ -0,0 +1,82 @@
+import argparse
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from typing import Dict, Set
+
+from dao.notifications import ALL_DATABASES, encode_message, hub_address
+
+
+logger = logging.getLogger(__name__)
+
+# Подписчик, у которого накопилось больше неотправленных байт, отключается
+MAX_BUFFER = 1024 * 1024
+
+
+class NotificationHub:
+    """Рассылает уведомления об изменениях базы данных подписчикам по локальному TCP.
+
+    Сообщения - строки JSON:
+        {"subscribe": "<ключ базы>"}                     - подписаться (ключ "*" - все базы)
+        {"publish": "<ключ базы>", "tables": [...]}      - сообщить об изменении
+    Подписчики получают {"db": "<ключ базы>", "tables": [...]}.
+    """
+
+    def __init__(self):
+        self.subscribers: Dict[str, Set[asyncio.StreamWriter]] = defaultdict(set)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        keys = set()
+        try:
+            while line := await reader.readline():
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    logger.warning('Некорректное сообщение: %r', line)
+                    continue
+                if 'subscribe' in message:
+                    keys.add(message['subscribe'])
+                    self.subscribers[message['subscribe']].add(writer)
+                elif 'publish' in message:
+                    self.publish(message['publish'], message.get('tables', []))
+        except ConnectionError:
+            pass
+        finally:
+            for key in keys:
+                self.subscribers[key].discard(writer)
+            writer.close()
+
+    def publish(self, key: str, tables):
+        data = encode_message({'db': key, 'tables': tables})
+        for writer in self.subscribers.get(key, set()) | self.subscribers.get(ALL_DATABASES, set()):
+            if writer.transport.get_write_buffer_size() > MAX_BUFFER:
+                writer.close()
+            else:
+                writer.write(data)
+
+
+async def serve(host: str, port: int):
+    hub = NotificationHub()
+    server = await asyncio.start_server(hub.handle, host, port)
+    logger.info('Концентратор уведомлений запущен на %s:%d', host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    default_host, default_port = hub_address() or ('127.0.0.1', 8766)
+    parser = argparse.ArgumentParser(description='Концентратор уведомлений об изменениях базы данных')
+    parser.add_argument('--host', default=default_host)
+    parser.add_argument('--port', type=int, default=default_port)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
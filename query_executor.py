@@ -0,0 +1,129 @@
+import logging
+from itertools import count
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal, pyqtSlot
+
+from dao.connection import close_thread_daos
+
+
+logger = logging.getLogger(__name__)
+
+
+class _QueryRunnable(QRunnable):
+
+    def __init__(self, executor: 'QueryExecutor', job_id: int, query: Callable[[], Any]):
+        super().__init__()
+        self.executor = executor
+        self.job_id = job_id
+        self.query = query
+
+    def run(self):
+        try:
+            result = self.query()
+        except Exception as error:
+            self._emit(self.executor.failed, error)
+        else:
+            self._emit(self.executor.finished, result)
+
+    def _emit(self, signal, value):
+        try:
+            signal.emit(self.job_id, value)
+        except RuntimeError:
+            # Окно и его исполнитель уже удалены (например, при выходе из приложения): результат не нужен
+            pass
+
+
+class QueryExecutor(QObject):
+    """Выполняет запросы к базе данных в отдельном потоке и возвращает результаты в поток GUI.
+
+    Запросы выполняются по одному в порядке отправки, поэтому запись и последующее
+    чтение не обгоняют друг друга. Запросы с одинаковым ключом объединяются: пока
+    один выполняется, хранится только последний из новых. Он запускается после того,
+    как результат выполнявшегося передан обработчику, поэтому читает уже обновленное
+    им состояние (например, курсор ленты изменений).
+    """
+
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        # Поток не завершается по простою, чтобы не терять его соединение с базой данных
+        self.pool.setExpiryTimeout(-1)
+        self._job_ids = count(1)
+        self._jobs: Dict[int, Tuple[Optional[str], Callable, Optional[Callable]]] = {}
+        self._running: Dict[str, int] = {}
+        self._pending: Dict[str, Tuple[Callable, Callable, Optional[Callable]]] = {}
+        self._closed = False
+        self.finished.connect(self._on_finished)
+        self.failed.connect(self._on_failed)
+
+    def submit(self, key: Optional[str], query: Callable[[], Any],
+               on_result: Callable[[Any], None] = None, on_error: Callable[[Exception], None] = None):
+        """Ставит query в очередь; on_result(result) будет вызван в потоке GUI.
+
+        key=None означает, что запрос не объединяется с другими (например, запись).
+        """
+        if self._closed:
+            return
+        if key is not None and key in self._running:
+            self._pending[key] = (query, on_result, on_error)
+            return
+        self._start(key, query, on_result, on_error)
+
+    def close(self):
+        """Отбрасывает ожидающие результаты и закрывает соединения рабочего потока."""
+        self._closed = True
+        self._pending.clear()
+        self.pool.start(_QueryRunnable(self, 0, close_thread_daos))
+
+    def _start(self, key, query, on_result, on_error):
+        job_id = next(self._job_ids)
+        self._jobs[job_id] = (key, on_result, on_error)
+        if key is not None:
+            self._running[key] = job_id
+        self.pool.start(_QueryRunnable(self, job_id, query))
+
+    def _finish(self, job_id: int) -> Tuple[Optional[Tuple[Callable, Optional[Callable]]], Optional[Tuple]]:
+        """Снимает задачу с учета; возвращает ее обработчики и ожидавший запрос с тем же ключом."""
+        job = self._jobs.pop(job_id, None)
+        if job is None or self._closed:
+            return None, None
+        key, on_result, on_error = job
+        pending = None
+        if key is not None:
+            del self._running[key]
+            pending = self._pending.pop(key, None)
+            if pending is not None:
+                pending = (key, *pending)
+        return (on_result, on_error), pending
+
+    def _start_pending(self, pending: Optional[Tuple]):
+        # Обработчик результата мог сам отправить запрос с этим ключом: он новее ожидавшего
+        if pending is not None and not self._closed and pending[0] not in self._running:
+            self._start(*pending)
+
+    @pyqtSlot(int, object)
+    def _on_finished(self, job_id: int, result):
+        handlers, pending = self._finish(job_id)
+        try:
+            if handlers is not None and handlers[0] is not None:
+                handlers[0](result)
+        finally:
+            self._start_pending(pending)
+
+    @pyqtSlot(int, object)
+    def _on_failed(self, job_id: int, error):
+        handlers, pending = self._finish(job_id)
+        try:
+            if handlers is None:
+                return
+            if handlers[1] is not None:
+                handlers[1](error)
+            else:
+                logger.error("Запрос к базе данных завершился ошибкой", exc_info=error)
+        finally:
+            self._start_pending(pending)
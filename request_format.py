@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+from entity.extra_work import ExtraWork, ExtraWorkDetails
+
+
+# Цвет фона строки в зависимости от статуса заявки
+STATUS_COLORS = {
+    "pending": "yellow",
+    "in progress": "orange",
+    "done": "green",
+    "paid": "grey",
+}
+
+
+def format_customer_request(request: ExtraWorkDetails) -> str:
+    """Формирует текст строки заявки для окна заказчика из строки get_all_extra_work_details."""
+    work_type_name = request.work_type_name or "Неизвестно"
+
+    item_text = f"ID: {request.id}, Клиент ID: {request.client_id}, Тип Работы: {work_type_name}, Статус: {request.status}"
+
+    # Если работа в процессе, добавляем информацию о работнике
+    if request.status == "in progress" and request.worker_full_name is not None:
+        worker_name = request.worker_full_name
+        worker_post = request.post_title or "Неизвестно"
+        item_text += f", Работник: {worker_name}, Квалификация: {worker_post}"
+
+    # Если работа завершена или оплачена, добавляем время выполнения
+    if request.status in ["done", "paid"] and request.duration_seconds is not None:
+        item_text += f", Время выполнения: {timedelta(seconds=request.duration_seconds)}"
+
+    return item_text
+
+
+def format_worker_work(work: ExtraWork) -> str:
+    """Формирует текст строки работы для окна работника."""
+    return f"ID: {work.id}, Статус: {work.status}"
@@ -0,0 +1,132 @@
+from bisect import bisect_left
+from typing import Callable, List, Optional
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QColor
+
+from entity.extra_work import ExtraWorkDetails
+from request_format import STATUS_COLORS
+
+
+class RequestTableModel(QAbstractTableModel):
+    """Модель списка заявок, которая подгружает строки страницами по мере прокрутки."""
+
+    HEADERS = ("ID", "Тип работы", "Статус")
+
+    def __init__(self, load_page: Callable[[int, int], List[ExtraWorkDetails]], page_size: int = 200, executor=None, parent=None):
+        super().__init__(parent)
+        # load_page(after_id, limit) возвращает строки get_extra_work_details_page, упорядоченные по ID
+        self.load_page = load_page
+        self.page_size = page_size
+        # Если передан QueryExecutor, страницы загружаются в его потоке
+        self.executor = executor
+        self._rows: List[ExtraWorkDetails] = []
+        self._ids: List[int] = []
+        self._exhausted = False
+        self._loading = False
+        self._colors = {status: QColor(color) for status, color in STATUS_COLORS.items()}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        request = self._rows[index.row()]
+        if role == Qt.DisplayRole:
+            column = index.column()
+            if column == 0:
+                return request.id
+            if column == 1:
+                return request.work_type_name or "Неизвестно"
+            return request.status
+        if role == Qt.BackgroundRole:
+            return self._colors.get(request.status)
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Загружает следующую страницу после последнего загруженного ID (keyset-пагинация)."""
+        if not self.canFetchMore(parent):
+            return
+        after_id = self._ids[-1] if self._ids else 0
+        page_size = self.page_size
+        if self.executor is None:
+            self._add_page(self.load_page(after_id, page_size), page_size)
+            return
+        self._loading = True
+        self.executor.submit(
+            'request_page',
+            lambda: self.load_page(after_id, page_size),
+            lambda page: self._add_page(page, page_size)
+        )
+
+    def _add_page(self, page: List[ExtraWorkDetails], page_size: int):
+        self._loading = False
+        if len(page) < page_size:
+            self._exhausted = True
+        # Пока страница загружалась, последние строки могли удалить или добавить из журнала изменений
+        last_id = self._ids[-1] if self._ids else 0
+        page = [request for request in page if request.id > last_id]
+        if not page:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._rows.extend(page)
+        self._ids.extend(request.id for request in page)
+        self.endInsertRows()
+
+    def row_at(self, row: int) -> Optional[ExtraWorkDetails]:
+        """Возвращает заявку в строке row или None."""
+        if 0 <= row < len(self._rows):
+            return self._rows[row]
+        return None
+
+    def apply_changes(self, changed: List[ExtraWorkDetails], deleted: List[int]):
+        """Применяет изменения из журнала: обновляет, вставляет и удаляет только затронутые строки."""
+        for work_id in deleted:
+            self._remove(work_id)
+        for request in changed:
+            self._upsert(request)
+
+    def reset(self):
+        """Сбрасывает загруженные строки; следующая страница будет загружена заново."""
+        self.beginResetModel()
+        self._rows = []
+        self._ids = []
+        self._exhausted = False
+        self._loading = False
+        self.endResetModel()
+
+    def _upsert(self, request: ExtraWorkDetails):
+        work_id = request.id
+        position = bisect_left(self._ids, work_id)
+        if position < len(self._ids) and self._ids[position] == work_id:
+            self._rows[position] = request
+            self.dataChanged.emit(self.index(position, 0), self.index(position, len(self.HEADERS) - 1))
+            return
+        # Строки за последней загруженной страницей придут через fetchMore
+        if position == len(self._ids) and not self._exhausted:
+            return
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, request)
+        self._ids.insert(position, work_id)
+        self.endInsertRows()
+
+    def _remove(self, work_id: int):
+        position = bisect_left(self._ids, work_id)
+        if position < len(self._ids) and self._ids[position] == work_id:
+            self.beginRemoveRows(QModelIndex(), position, position)
+            del self._rows[position]
+            del self._ids[position]
+            self.endRemoveRows()
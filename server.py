@@ -0,0 +1,95 @@
+import argparse
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from dao.aio import AsyncDatabase
+from dao.rpc import DAOS, decode, encode, encode_error
+
+
+logger = logging.getLogger(__name__)
+
+
+class ApiServer(ThreadingHTTPServer):
+    """HTTP-сервер, выполняющий операции DAO: чтения в пуле соединений, записи в одном потоке писателя."""
+
+    def __init__(self, address, db_name: str = 'prod', max_readers: int = 4):
+        super().__init__(address, ApiRequestHandler)
+        self.database = AsyncDatabase(db_name, max_readers)
+
+    def server_close(self):
+        super().server_close()
+        self.database.close()
+
+
+class ApiRequestHandler(BaseHTTPRequestHandler):
+    """POST /<dao>/<метод> с телом {"args": [...], "kwargs": {...}} возвращает {"result": ...} или {"error": ...}."""
+
+    # Постоянные соединения: клиентский DAO отправляет все запросы через одно соединение
+    protocol_version = 'HTTP/1.1'
+    server: ApiServer
+
+    def do_GET(self):
+        if self.path == '/health':
+            self.send_json(200, {'result': 'ok'})
+        else:
+            self.send_json(404, {'error': {'type': 'LookupError', 'message': f'Неизвестный путь {self.path}'}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        parts = self.path.strip('/').split('/')
+        async_dao = DAOS.get(parts[0]) if len(parts) == 2 else None
+        operation = async_dao.operations().get(parts[1]) if async_dao else None
+        if operation is None:
+            self.send_json(404, {'error': {'type': 'LookupError', 'message': f'Неизвестная операция {self.path}'}})
+            return
+
+        try:
+            request = json.loads(body or b'{}')
+            args = decode(request.get('args', []))
+            kwargs = decode(request.get('kwargs', {}))
+        except (ValueError, TypeError, KeyError) as error:
+            self.send_json(400, {'error': encode_error(error)})
+            return
+
+        try:
+            result = self.server.database.submit(operation, async_dao.dao_class, parts[1], args, kwargs).result()
+        except Exception as error:
+            logger.exception('Ошибка при выполнении %s', self.path)
+            self.send_json(500, {'error': encode_error(error)})
+            return
+        self.send_json(200, {'result': encode(result)})
+
+    def send_json(self, status: int, payload: dict):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format, *args)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='HTTP API к базе данных для окон приложения')
+    parser.add_argument('--db', default='prod', help='файл базы данных')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--readers', type=int, default=4, help='число соединений для чтения')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = ApiServer((args.host, args.port), args.db, args.readers)
+    logger.info('Сервер запущен на http://%s:%d, база данных %s', args.host, args.port, args.db)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,20 @@
+from typing import TYPE_CHECKING
+
 from PyQt5.QtWidgets import QMainWindow, QPushButton, QVBoxLayout, QWidget, QComboBox
-from customer_request_widget import CustomerRequestWidget
+from dao.connection import resolve_dao_class
 from dao.worker import WorkerDAO
-from manager_widget import ManagerWindow
-from worker_window import WorkerWindow
+
+# Окна ролей импортируются при открытии: при запуске нужно только окно выбора роли
+if TYPE_CHECKING:
+    from customer_request_widget import CustomerRequestWidget
+    from manager_widget import ManagerWindow
+    from worker_window import WorkerWindow
 
 
 class StartWindow(QMainWindow):
-    manager_window: ManagerWindow
-    customer_request_widget: CustomerRequestWidget
-    worker_window: WorkerWindow
+    manager_window: 'ManagerWindow'
+    customer_request_widget: 'CustomerRequestWidget'
+    worker_window: 'WorkerWindow'
 
     def __init__(self, db_name='prod'):
         super().__init__()
@@ -52,18 +58,20 @@ class StartWindow(QMainWindow):
 
     def load_workers(self):
         """Загружает список всех работников в комбобокс."""
-        worker_dao = WorkerDAO(self.db_name)
-        workers = worker_dao.get_all_workers()
-        self.worker_map = {worker.full_name: worker.id for worker in workers}
+        worker_dao = resolve_dao_class(WorkerDAO)(self.db_name)
+        workers = worker_dao.get_worker_names()
+        self.worker_map = {full_name: worker_id for worker_id, full_name in workers}
         self.worker_combo.addItems(self.worker_map.keys())
         worker_dao.close()
 
     def open_manager_window(self):
+        from manager_widget import ManagerWindow
         self.manager_window = ManagerWindow(self.db_name)
         self.manager_window.show()
         self.close()
 
     def open_customer_request_widget(self):
+        from customer_request_widget import CustomerRequestWidget
         self.customer_request_widget = CustomerRequestWidget(self.db_name)
         self.customer_request_widget.show()
         self.close()
@@ -72,6 +80,7 @@ class StartWindow(QMainWindow):
         selected_worker_name = self.worker_combo.currentText()
         worker_id = self.worker_map.get(selected_worker_name)
         if worker_id is not None:
+            from worker_window import WorkerWindow
             self.worker_window = WorkerWindow(worker_id, self.db_name)
             self.worker_window.show()
             self.close()
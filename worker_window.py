@@ -1,17 +1,21 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QListWidget, QListWidgetItem
-from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QListWidget
 from PyQt5.QtCore import QTimer
 from datetime import datetime
 
+from change_notifier import ChangeNotifier
+from dao.change_feed import ChangeFeed
+from dao.connection import thread_dao
 from dao.extra_work import ExtraWorkDAO
 from dao.worker import WorkerDAO
 from entity.worker import Worker
+from list_sync import KeyedListSync
+from query_executor import QueryExecutor
+from request_format import STATUS_COLORS, format_worker_work
 
 
 class WorkerWindow(QWidget):
 
-    extra_work_dao: ExtraWorkDAO
-    worker_dao: WorkerDAO
+    executor: QueryExecutor
     worker: Worker
 
     def __init__(self, worker_id, db_name='prod'):
@@ -21,28 +25,35 @@ class WorkerWindow(QWidget):
         self.setGeometry(100, 100, 600, 400)
 
         self.worker_id = worker_id
+        self.worker = None
 
-        # Инициализация DAO
-        self.extra_work_dao = ExtraWorkDAO(db_name)
-        self.worker_dao = WorkerDAO(db_name)
-
-        # Получаем информацию о работнике
-        self.worker = self.worker_dao.get_worker(worker_id)
-        worker_name = self.worker.full_name if self.worker else "Неизвестно"
+        # Все запросы к базе данных выполняются в потоке исполнителя, DAO создаются в нем же
+        self.db_name = db_name
+        self.executor = QueryExecutor(self)
 
         # Основной лейаут
         main_layout = QVBoxLayout()
 
         # Отображаем имя работника
-        self.worker_label = QLabel(f"Работник: {worker_name}")
+        self.worker_label = QLabel("Работник: ")
         main_layout.addWidget(self.worker_label)
 
         # Отображаем баланс работника
-        self.balance_label = QLabel(f"Счет: {self.worker.balance:.2f}")
+        self.balance_label = QLabel("Счет: ")
         main_layout.addWidget(self.balance_label)
 
+        # Получаем информацию о работнике
+        self.update_balance()
+
         # Лейаут для списка работ
         self.work_list = QListWidget()
+        self.work_sync = KeyedListSync(self.work_list)
+        self.work_feed = ChangeFeed(
+            lambda: self.dao(ExtraWorkDAO).get_extra_work_change_cursor(),
+            lambda: self.dao(ExtraWorkDAO).find_extra_works(assignee=self.worker_id),
+            lambda cursor: self.dao(ExtraWorkDAO).get_extra_works_changed_since(cursor),
+            predicate=lambda work: work.assignee == self.worker_id  # Только работы этого работника
+        )
         self.load_works()
         main_layout.addWidget(self.work_list)
 
@@ -54,44 +65,67 @@ class WorkerWindow(QWidget):
         # Устанавливаем основной лейаут
         self.setLayout(main_layout)
 
-        # Устанавливаем таймер для автоматического обновления списка работ и баланса
+        # Таймер опрашивает базу данных, только пока недоступен концентратор уведомлений
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.load_works)
         self.timer.timeout.connect(self.update_balance)
-        self.timer.start(4000)  # Обновление каждые 4000 миллисекунд (4 секунды)
+        self.notifier = ChangeNotifier(self.db_name, self.timer, self)
+        self.notifier.changed.connect(self.on_tables_changed)
+        self.notifier.start()
+
+    def dao(self, dao_class):
+        """Возвращает DAO потока исполнителя; вызывается только внутри запросов исполнителя."""
+        return thread_dao(dao_class, self.db_name)
+
+    def on_tables_changed(self, tables):
+        """Обновляет данные, зависящие от измененных таблиц."""
+        if "extra_work" in tables:
+            self.load_works()
+        if "worker" in tables:
+            self.update_balance()
 
     def load_works(self):
-        """Загружает и отображает список всех работ, назначенных этому работнику."""
-        works = self.extra_work_dao.get_all_extra_works()
-        self.work_list.clear()
-        for work in works:
-            if work[4] == self.worker_id:  # Проверяем, что работа назначена этому работнику
-                item_text = f"ID: {work[0]}, Статус: {work[6]}"
-                item = QListWidgetItem(item_text)
-
-                # Устанавливаем цвет фона в зависимости от статуса
-                if work[6] == "pending":
-                    item.setBackground(QColor("yellow"))
-                elif work[6] == "in progress":
-                    item.setBackground(QColor("orange"))  # Цвет для работы в процессе
-                elif work[6] == "done":
-                    item.setBackground(QColor("green"))
-                elif work[6] == "paid":
-                    item.setBackground(QColor("grey"))  # Цвет для оплаченной работы
-
-                self.work_list.addItem(item)
+        """Запрашивает изменения работ этого работника в потоке исполнителя."""
+        self.executor.submit('works', self.work_feed.fetch, self.show_works)
+
+    def show_works(self, batch):
+        """Применяет изменения работ и обновляет в списке только затронутые строки."""
+        if not self.work_feed.apply(batch):
+            return
+        self.notifier.loaded()
+
+        self.work_sync.remove_many(self.work_feed.removed_ids)
+        for work_id in self.work_feed.changed_ids:
+            work = self.work_feed.rows[work_id]
+            self.work_sync.upsert(work_id, format_worker_work(work), STATUS_COLORS.get(work.status))
 
     def complete_work(self):
         """Завершает выбранную работу и фиксирует время окончания."""
-        current_item = self.work_list.currentItem()
-        if current_item:
-            work_id = int(current_item.text().split(",")[0].split(":")[1].strip())
+        work_id = self.work_sync.key_at(self.work_list.currentRow())
+        if work_id is not None:
             end_time = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            self.extra_work_dao.update_extra_work(work_id, status="done", end_time=end_time)
-            self.load_works()
+            self.executor.submit(
+                None,
+                lambda: self.dao(ExtraWorkDAO).update_extra_work(work_id, status="done", end_time=end_time),
+                lambda result: self.load_works()
+            )
 
     def update_balance(self):
-        """Обновляет отображение баланса работника."""
-        self.worker = self.worker_dao.get_worker(self.worker_id)
+        """Запрашивает данные работника для отображения имени и баланса."""
+        self.executor.submit('worker', lambda: self.dao(WorkerDAO).get_worker(self.worker_id), self.show_worker)
+
+    def show_worker(self, worker):
+        """Обновляет отображение имени и баланса работника."""
+        self.worker = worker
         if self.worker:
-            self.balance_label.setText(f"Счет: {self.worker.balance:.2f}")
\ No newline at end of file
+            self.worker_label.setText(f"Работник: {self.worker.full_name}")
+            self.balance_label.setText(f"Счет: {self.worker.balance:.2f}")
+        else:
+            self.worker_label.setText("Работник: Неизвестно")
+
+    def closeEvent(self, event):
+        """Останавливает обновление и закрывает соединения с базой данных при закрытии окна."""
+        self.timer.stop()
+        self.notifier.close()
+        self.executor.close()
+        event.accept()
\ No newline at end of file